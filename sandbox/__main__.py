@@ -1,56 +1,126 @@
+import os
+import time
+
 import pygame
 
 from . import view
 from .controllers import (
     # PygameGamepad, PygameIntermittentGamepad,
-    PygameKeyboard, PygameIntermittentKeyboard
+    KeyBindings, PygameKeyboard, PygameIntermittentKeyboard
 )
-from .game_rules import Mover
-from .model import Character, Point
+from .game_rules import CollisionWorld, Mover
+from .model import Character, Obstacle, Point
+from .profiling import FrameProfiler
 from .settings import PygameKeyboardSettings, get_ui_settings
+from .timing import AutoRepeat, FrameScheduler
 
 
 SCREEN_SIZE = (1000, 500)
+WORLD_SIZE = (3000, 1500)
+# Совпадает с размером спрайта персонажа.
+CHARACTER_SIZE = (100, 100)
+WALL_COLOR = (60, 60, 60)
+TARGET_FPS = 60
+SIMULATION_RATE = 60
+# Повтор удерживаемых кнопок в меню и настройках.
+REPEAT_DELAY_MS = 500
+REPEAT_INTERVAL_MS = 500
+# Если переменная задана, то при выходе замеры последних кадров
+# будут записаны в этот файл в формате JSONL.
+FRAME_PROFILE_PATH = os.environ.get('SANDBOX_FRAME_PROFILE')
+
+start_time = time.perf_counter()
 
 pygame.init()
-pygame.key.set_repeat(500)
-screen = pygame.display.set_mode(SCREEN_SIZE)
+view.fonts.fonts.use_cache_file(view.fonts.FONTS_CACHE_FILE_PATH)
+display = view.display.DisplayManager(SCREEN_SIZE, start_time)
+display.first_frame_handlers.append(
+    lambda seconds: print(f"Time to first frame: {seconds * 1000:.1f} ms")
+)
+
+profiler = FrameProfiler(frame_budget=1 / TARGET_FPS)
 
 character = Character(Point(300, 300))
+world = CollisionWorld(*WORLD_SIZE)
+world.add_character(character, *CHARACTER_SIZE)
+walls = [
+    Obstacle(600, 200, 60, 600),
+    Obstacle(1200, 900, 800, 60),
+    Obstacle(2200, 100, 60, 900),
+    Obstacle(400, 1200, 400, 60),
+]
+for wall in walls:
+    world.add_obstacle(wall)
+
+camera = view.camera.Camera(SCREEN_SIZE, WORLD_SIZE)
+camera.follow(character, *CHARACTER_SIZE)
 
 # controller = PygameGamepad()
 # intermittent_controller = PygameIntermittentGamepad()
+# Для нескольких геймпадов с подключением на ходу:
+# gamepads = GamepadManager(PygameGamepad)
+# gamepads.added_handlers.append(lambda instance_id, controller: ...)
 
 controller_settings = get_ui_settings(PygameKeyboardSettings)
-controller = PygameKeyboard(controller_settings)
-intermittent_controller = PygameIntermittentKeyboard(controller_settings)
-# тут может быть проблема в том, что у одного из контроллеров не изменятся настройки
-# при изменении через свойства.
-# Да, проблема подтвердилась(.
-
-mover = Mover(controller)
-
-settings_window = view.windows.SettingsWindow(
-    caption="settings",
-    size=SCREEN_SIZE,
-    settings=controller_settings,
-    controller=intermittent_controller
+# Оба контроллера читают одни и те же назначения,
+# поэтому переназначение клавиши в настройках действует в обоих.
+key_bindings = KeyBindings.from_settings(controller_settings)
+controller = PygameKeyboard(key_bindings)
+intermittent_controller = PygameIntermittentKeyboard(
+    key_bindings,
+    repeat=AutoRepeat(REPEAT_DELAY_MS, REPEAT_INTERVAL_MS)
 )
 
-game_window = view.windows.GameWindow(
-    caption='Controls tests',
-    size=SCREEN_SIZE,
-    sprite=view.sprites.Sprite(character),
-    mover=mover,
-    controller=controller
+mover = Mover(controller, world)
+
+settings_window = view.windows.LazyWindow(
+    lambda: view.windows.SettingsWindow(
+        caption="settings",
+        display=display,
+        settings=controller_settings,
+        controller=intermittent_controller,
+        profiler=profiler
+    )
+)
+
+scheduler = FrameScheduler(fps=TARGET_FPS, simulation_rate=SIMULATION_RATE)
+scenes = view.scenes.SceneStack()
+
+game_window = view.windows.LazyWindow(
+    lambda: view.windows.GameWindow(
+        caption='Controls tests',
+        display=display,
+        sprite=view.sprites.Sprite(character),
+        mover=mover,
+        controller=controller,
+        scheduler=scheduler,
+        profiler=profiler,
+        camera=camera,
+        scenery=[
+            view.sprites.Sprite(
+                None,
+                view.sprites.get_solid_surface((wall.width, wall.height), WALL_COLOR),
+                location=(wall.left, wall.top)
+            )
+            for wall
+            in walls
+        ]
+    )
 )
 
 start_window = view.windows.MenuWindow(
     caption='Controls tests | Menu',
-    size=SCREEN_SIZE,
-    controller=intermittent_controller
+    display=display,
+    controller=intermittent_controller,
+    profiler=profiler
 )
-start_window.play_button_handlers.append(game_window.show)
-start_window.settings_button_handlers.append(settings_window.show)
+start_window.play_button_handlers.append(lambda: scenes.push(game_window.window))
+start_window.settings_button_handlers.append(
+    lambda: scenes.push(settings_window.window)
+)
+
+scenes.push(start_window)
+view.scenes.MainLoop(scenes, scheduler).run()
 
-start_window.show()
+if FRAME_PROFILE_PATH:
+    profiler.export_jsonl(FRAME_PROFILE_PATH)
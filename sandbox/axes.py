@@ -0,0 +1,133 @@
+import math
+from enum import Enum
+from typing import Callable
+
+import numpy as np
+
+
+class DeadZoneShape(Enum):
+    # Мёртвая зона — круг вокруг центра стика, направление наклона не искажается.
+    RADIAL = 0
+    # Мёртвая зона считается по каждой оси отдельно,
+    # удобно, когда нужно двигаться строго по горизонтали или вертикали.
+    AXIAL = 1
+
+
+class ResponseCurve:
+    """Зависимость выходного значения оси от наклона.
+    Принимает и возвращает величину в диапазоне от 0 до 1.
+    """
+    def __init__(self, function: Callable[[float], float]):
+        self.function = function
+
+    @classmethod
+    def linear(cls) -> 'ResponseCurve':
+        return cls(lambda value: value)
+
+    @classmethod
+    def exponential(cls, exponent: float = 2.0) -> 'ResponseCurve':
+        """Слабый наклон даёт точное медленное движение, сильный — быстрое."""
+        return cls(lambda value: value ** exponent)
+
+
+class StickProcessor:
+    """Обрабатывает значения осей стика: мёртвые зоны, антимёртвая зона
+    и кривая отклика.
+
+    Всё это при создании компилируется в одну таблицу
+    «наклон -> выходная величина», поэтому обработка значения стоит
+    одного обращения по индексу в таблице.
+    """
+    def __init__(
+            self,
+            dead_zone: float = 0.05,
+            shape: DeadZoneShape = DeadZoneShape.RADIAL,
+            outer_dead_zone: float = 0.0,
+            anti_dead_zone: float = 0.0,
+            curve: ResponseCurve | None = None,
+            resolution: int = 1024):
+        """
+        Args:
+            dead_zone: Наклон, до которого стик считается в центре.
+            shape: Форма мёртвой зоны.
+            outer_dead_zone: Наклон у края, который уже считается полным.
+            anti_dead_zone: Минимальная величина на выходе сразу за мёртвой зоной.
+            Нужна, если игра сама игнорирует малые значения.
+            curve: Кривая отклика, по умолчанию линейная.
+            resolution: Размер таблицы.
+        """
+        if not 0 <= dead_zone < 1 - outer_dead_zone:
+            raise ValueError("dead zones leave no working range of the stick")
+        if not 0 <= anti_dead_zone < 1:
+            raise ValueError("anti dead zone must be in [0, 1)")
+        self._shape = shape
+        self._dead_zone = dead_zone
+        self._last_index = resolution - 1
+        self._table = self._compile(
+            dead_zone, 1 - outer_dead_zone, anti_dead_zone,
+            curve or ResponseCurve.linear()
+        )
+        self._table_list: list[float] = self._table.tolist()
+
+    @property
+    def shape(self) -> DeadZoneShape:
+        return self._shape
+
+    @property
+    def dead_zone(self) -> float:
+        return self._dead_zone
+
+    def _compile(
+            self,
+            dead_zone: float,
+            full_tilt: float,
+            anti_dead_zone: float,
+            curve: ResponseCurve) -> np.ndarray:
+        table = np.zeros(self._last_index + 1, dtype=np.float64)
+        for i in range(self._last_index + 1):
+            tilt = i / self._last_index
+            if tilt <= dead_zone:
+                continue
+            normalized = min((tilt - dead_zone) / (full_tilt - dead_zone), 1.0)
+            table[i] = anti_dead_zone + (1 - anti_dead_zone) * curve.function(normalized)
+        return table
+
+    def process_axis(self, value: float) -> float:
+        """Обрабатывает одну ось как отдельный элемент управления."""
+        magnitude = self._table_list[int(min(abs(value), 1.0) * self._last_index + 0.5)]
+        return magnitude if value >= 0 else -magnitude
+
+    def process(self, x: float, y: float) -> tuple[float, float]:
+        """Обрабатывает пару осей одного стика."""
+        if self._shape is DeadZoneShape.AXIAL:
+            return self.process_axis(x), self.process_axis(y)
+
+        tilt = math.hypot(x, y)
+        magnitude = self._table_list[int(min(tilt, 1.0) * self._last_index + 0.5)]
+        if not magnitude:
+            return 0.0, 0.0
+        scale = magnitude / tilt
+        return x * scale, y * scale
+
+    def process_many(self, sticks: np.ndarray) -> np.ndarray:
+        """Обрабатывает сразу много стиков.
+
+        Args:
+            sticks: Массив формы (n, 2) со значениями осей x и y.
+
+        Returns:
+            Новый массив той же формы.
+        """
+        if self._shape is DeadZoneShape.AXIAL:
+            indexes = self._indexes(np.abs(sticks))
+            return np.copysign(self._table[indexes], sticks)
+
+        tilts = np.hypot(sticks[:, 0], sticks[:, 1])
+        magnitudes = self._table[self._indexes(tilts)]
+        scales = np.divide(
+            magnitudes, tilts, out=np.zeros_like(magnitudes), where=magnitudes > 0
+        )
+        return sticks * scales[:, np.newaxis]
+
+    def _indexes(self, values: np.ndarray) -> np.ndarray:
+        return (np.minimum(values, 1.0) * self._last_index + 0.5).astype(np.intp)
@@ -0,0 +1,230 @@
+import time
+from array import array
+from typing import Callable, Sequence
+
+from .controllers import ActionMap
+from .snapshots import InputSnapshot
+
+
+class Combo:
+    """Последовательность шагов, которую нужно выполнить за window секунд.
+    Шаг — маска действий, которые должны быть активны одновременно,
+    причём хотя бы одно из них нажато в этом кадре.
+    """
+    __slots__ = ('name', 'steps', 'window')
+
+    def __init__(self, name: str, steps: tuple[int, ...], window: float):
+        self.name = name
+        self.steps = steps
+        self.window = window
+
+
+class _Node:
+    """Состояние автомата: пройденный префикс одной или нескольких комбинаций."""
+    __slots__ = ('children', 'by_bit', 'expected_mask', 'combos', 'max_window')
+
+    def __init__(self):
+        # маска шага -> следующее состояние
+        self.children: dict[int, _Node] = {}
+        # бит действия -> шаги из этого состояния, в которые оно входит
+        self.by_bit: dict[int, list[tuple[int, _Node]]] = {}
+        # все действия, которые продвигают автомат из этого состояния
+        self.expected_mask = 0
+        # комбинации, которые завершаются в этом состоянии
+        self.combos: list[Combo] = []
+        # дольше этого ни одна комбинация через это состояние не выполняется
+        self.max_window = 0.0
+
+    def get_or_add_child(self, step_mask: int) -> '_Node':
+        child = self.children.get(step_mask)
+        if child is not None:
+            return child
+        child = _Node()
+        self.children[step_mask] = child
+        self.expected_mask |= step_mask
+        mask = step_mask
+        while mask:
+            bit = mask & -mask
+            self.by_bit.setdefault(bit, []).append((step_mask, child))
+            mask ^= bit
+        return child
+
+
+class ComboLibrary:
+    """Набор комбинаций, скомпилированный в один автомат-префиксное дерево.
+
+    Комбинации с общим началом проходят его один раз, а из каждого состояния
+    переходы ищутся по битам нажатых действий, поэтому стоимость обработки
+    ввода не растёт с количеством комбинаций. Одна библиотека может быть
+    общей для трекеров всех игроков.
+    """
+    def __init__(self, actions: ActionMap):
+        """
+        Args:
+            actions: Карта действий, по именам которой задаются шаги.
+        """
+        self._actions = actions
+        self._root = _Node()
+        self._combos: list[Combo] = []
+        self._alphabet = 0
+
+    @property
+    def root(self) -> _Node:
+        return self._root
+
+    @property
+    def alphabet(self) -> int:
+        """Маска всех действий, которые встречаются в комбинациях."""
+        return self._alphabet
+
+    @property
+    def combos(self) -> tuple[Combo, ...]:
+        return tuple(self._combos)
+
+    def add(
+            self,
+            name: str,
+            steps: Sequence[str | Sequence[str]],
+            window_ms: int = 500) -> Combo:
+        """Регистрирует комбинацию.
+
+        Args:
+            name: Имя, которое трекер вернёт при выполнении.
+            steps: Шаги по порядку. Шаг — имя действия или несколько имён,
+            которые нужно зажать вместе. Аккорд — это комбинация из одного шага.
+            window_ms: За сколько миллисекунд от первого шага нужно успеть
+            выполнить последний.
+        """
+        if not steps:
+            raise ValueError("combo must have at least one step")
+        step_masks = tuple(self._compile_step(step) for step in steps)
+        combo = Combo(name, step_masks, window_ms / 1000)
+
+        node = self._root
+        for step_mask in combo.steps:
+            node = node.get_or_add_child(step_mask)
+            node.max_window = max(node.max_window, combo.window)
+            self._alphabet |= step_mask
+        node.combos.append(combo)
+        self._combos.append(combo)
+        return combo
+
+    def _compile_step(self, step: str | Sequence[str]) -> int:
+        names = (step, ) if isinstance(step, str) else step
+        mask = 0
+        for name in names:
+            mask |= 1 << self._actions.id_of(name)
+        return mask
+
+
+class InputHistory:
+    """Кольцевой буфер последних снимков ввода со временем их получения."""
+    def __init__(self, capacity: int = 64):
+        self._snapshots: list[InputSnapshot | None] = [None] * capacity
+        self._times = array('d', bytes(8 * capacity))
+        self._capacity = capacity
+        self._index = 0
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def append(self, snapshot: InputSnapshot, now: float) -> None:
+        self._snapshots[self._index] = snapshot
+        self._times[self._index] = now
+        self._index = (self._index + 1) % self._capacity
+        self._count = min(self._count + 1, self._capacity)
+
+    def recent(self) -> list[tuple[float, InputSnapshot]]:
+        """Записи от старых к новым."""
+        start = (self._index - self._count) % self._capacity
+        indexes = [(start + offset) % self._capacity for offset in range(self._count)]
+        return [(self._times[i], self._snapshots[i]) for i in indexes]  # type: ignore
+
+
+class ComboTracker:
+    """Распознаёт комбинации одного игрока по снимкам его контроллера.
+
+    Хранит только состояния автомата, в которых сейчас находится ввод,
+    и время начала каждой попытки. Каждый новый снимок продвигает эти
+    состояния, история заново не просматривается.
+    Нажатие действия из комбинаций, которого не ждут в состоянии,
+    обрывает попытку, а действия, не входящие ни в одну комбинацию,
+    на распознавание не влияют.
+    """
+    def __init__(
+            self,
+            library: ComboLibrary,
+            history_size: int = 64,
+            clock: Callable[[], float] = time.monotonic):
+        self._library = library
+        self._clock = clock
+        self._history = InputHistory(history_size)
+        # состояние автомата -> время первого шага самой поздней попытки
+        self._threads: dict[_Node, float] = {}
+        self.matched_handlers: list[Callable[[Combo], None]] = []
+
+    @property
+    def history(self) -> InputHistory:
+        return self._history
+
+    def reset(self) -> None:
+        self._threads.clear()
+
+    def feed(self, snapshot: InputSnapshot, now: float | None = None) -> list[Combo]:
+        """Обрабатывает снимок очередного кадра.
+
+        Returns:
+            Комбинации, выполненные в этом кадре.
+        """
+        if now is None:
+            now = self._clock()
+        self._history.append(snapshot, now)
+        pressed = snapshot.pressed & self._library.alphabet
+        if not pressed:
+            return []
+
+        mask = snapshot.mask
+        root = self._library.root
+        matched: list[Combo] = []
+        threads: dict[_Node, float] = {}
+        # Из корня попытка начинается на каждом нажатии.
+        candidates = [(root, now)]
+        candidates += self._threads.items()
+
+        for node, start in candidates:
+            if node is not root and now - start > node.max_window:
+                continue
+            advanced = False
+            for child in self._matching_children(node, pressed, mask):
+                advanced = True
+                for combo in child.combos:
+                    if now - start <= combo.window:
+                        matched.append(combo)
+                if child.children and threads.get(child, -1.0) < start:
+                    threads[child] = start
+            # Нажатие может быть частью ещё не собранного аккорда,
+            # тогда попытка ждёт остальные действия.
+            if (
+                    not advanced
+                    and node is not root
+                    and not pressed & ~node.expected_mask
+                    and threads.get(node, -1.0) < start):
+                threads[node] = start
+        self._threads = threads
+
+        for combo in matched:
+            for handler in self.matched_handlers:
+                handler(combo)
+        return matched
+
+    @staticmethod
+    def _matching_children(node: _Node, pressed: int, mask: int) -> list[_Node]:
+        children = []
+        while pressed:
+            bit = pressed & -pressed
+            pressed ^= bit
+            for step_mask, child in node.by_bit.get(bit, ()):
+                if mask & step_mask == step_mask and child not in children:
+                    children.append(child)
+        return children
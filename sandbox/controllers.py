@@ -1,19 +1,91 @@
 from abc import ABC, abstractmethod
+from array import array
 from enum import Enum
+from typing import Callable, Sequence
 
 import pygame
 
+from .axes import StickProcessor
+from .input_hub import InputHub, input_hub
 from .settings import ControllerSettings
+from .snapshots import InputSnapshot
+from .timing import AutoRepeat
+
+
+DEFAULT_ACTIONS = ('up', 'right', 'down', 'left', 'accept', 'quit')
+
+
+class ActionMap:
+    """Состояние произвольного набора именованных действий.
+
+    Флаги активации и величины лежат в непрерывных массивах и адресуются
+    номером действия, поэтому сброс всех действий — это одно копирование
+    заранее подготовленных нулей, сколько бы действий ни было.
+    """
+    def __init__(self, names: Sequence[str]):
+        if len(set(names)) != len(names):
+            raise ValueError("action names must be unique")
+        self._names = tuple(names)
+        self._ids = {name: i for i, name in enumerate(self._names)}
+        self.flags = bytearray(len(self._names))
+        self.values = array('f', bytes(4 * len(self._names)))
+        self._zero_flags = bytes(len(self._names))
+        self._zero_values = array('f', bytes(4 * len(self._names)))
+
+    @property
+    def names(self) -> tuple[str, ...]:
+        return self._names
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._ids
+
+    def id_of(self, name: str) -> int:
+        return self._ids[name]
+
+    def is_active(self, action_id: int) -> bool:
+        return self.flags[action_id] != 0
+
+    def value(self, action_id: int) -> float:
+        return self.values[action_id]
+
+    def activate(self, action_id: int, value: float = 1) -> None:
+        self.flags[action_id] = 1
+        self.values[action_id] = value
+
+    def deactivate(self, action_id: int) -> None:
+        self.flags[action_id] = 0
+        self.values[action_id] = 0
+
+    def reset(self) -> None:
+        self.flags[:] = self._zero_flags
+        self.values[:] = self._zero_values
 
 
 class Control:
     """Представляет один элемент управления на каком либо устройстве ввода.
     Это может быть клавиатура, геймпад, джойстик и т.д.
+
+    Сам контрол хранит только номер клавиши, а состояние читает и пишет
+    в ячейку ActionMap своего контроллера.
     """
-    def __init__(self, key_number: int):
+    def __init__(
+            self,
+            key_number: int,
+            actions: ActionMap | None = None,
+            action_id: int = 0):
+        """
+        Args:
+            key_number: Номер клавиши, кнопки или оси на устройстве.
+            actions: Карта действий, в которой хранится состояние.
+            Если не указана, то контрол получает собственную.
+            action_id: Номер действия контрола в карте.
+        """
         self._key_number = key_number
-        self._activated = False
-        self._value = 0
+        self._key_number_changed_handlers: list[Callable[[Control], None]] = []
+        self.attach(actions or ActionMap(('control', )), action_id)
 
     @property
     def key_number(self) -> int:
@@ -21,14 +93,27 @@ class Control:
 
     @property
     def activated(self) -> bool:
-        return self._activated
+        return self._flags[self._action_id] != 0
 
     @property
     def value(self) -> float:
-        return self._value
+        return self._values[self._action_id]
+
+    def attach(self, actions: ActionMap, action_id: int) -> None:
+        """Переносит состояние контрола в ячейку другой карты действий."""
+        self._actions = actions
+        self._action_id = action_id
+        # Сброс карты не пересоздаёт массивы, поэтому ссылки на них можно хранить.
+        self._flags = actions.flags
+        self._values = actions.values
 
     def update_key_number(self, key_number: int) -> None:
         self._key_number = key_number
+        for handler in self._key_number_changed_handlers:
+            handler(self)
+
+    def add_key_number_changed_handler(self, handler: Callable[['Control'], None]):
+        self._key_number_changed_handlers.append(handler)
 
     def activate(self, value: float = 1):
         """Должен вызываться при нажатии на реальный элемент управления контроллера.
@@ -37,25 +122,104 @@ class Control:
             value: Величина с которой произошло нажатие.
             Если не нужно учитывать величину нажатия, то по умолчанию значение 1.
         """
-        self._activated = True
-        self._value = value
+        self._flags[self._action_id] = 1
+        self._values[self._action_id] = value
 
     def deactivate(self):
         """Должен вызываться при отжатии реального элемента управления контроллера.
         """
-        self._activated = False
-        self._value = 0
+        self._flags[self._action_id] = 0
+        self._values[self._action_id] = 0
+
+
+class KeyBindings:
+    """Назначения клавиш, общие для всех клавиатурных контроллеров.
+
+    Хранит номер клавиши для каждого действия и скомпилированную таблицу
+    клавиша -> действия. Таблица перестраивается только при переназначении,
+    поэтому поиск по нажатой клавише всегда стоит одно обращение к словарю.
+    """
+    def __init__(self, keys: dict[str, int]):
+        self._keys = dict(keys)
+        self._table: dict[int, tuple[str, ...]] = {}
+        self.changed_handlers: list[Callable[[str, int], None]] = []
+        self._rebuild()
+
+    @classmethod
+    def from_settings(cls, settings: ControllerSettings) -> 'KeyBindings':
+        return cls({
+            'up': settings.up.value,
+            'right': settings.right.value,
+            'down': settings.down.value,
+            'left': settings.left.value,
+            'accept': pygame.K_RETURN,
+            'quit': pygame.K_ESCAPE,
+        })
+
+    @property
+    def actions(self) -> tuple[str, ...]:
+        return tuple(self._keys)
+
+    def get_key(self, action: str) -> int:
+        return self._keys[action]
+
+    def get_actions(self, key_number: int) -> tuple[str, ...]:
+        return self._table.get(key_number, ())
+
+    def bind(self, action: str, key_number: int) -> None:
+        if self._keys.get(action) == key_number:
+            return
+        self._keys[action] = key_number
+        self._rebuild()
+        for handler in self.changed_handlers:
+            handler(action, key_number)
+
+    def _rebuild(self) -> None:
+        table: dict[int, list[str]] = {}
+        for action, key_number in self._keys.items():
+            table.setdefault(key_number, []).append(action)
+        self._table = {key: tuple(actions) for key, actions in table.items()}
 
 
 class Controller(ABC):
-    """Представляет физическое устройство ввода команд."""
-    def __init__(self):
-        self._move_up = Control(0)
-        self._move_right = Control(0)
-        self._move_down = Control(0)
-        self._move_left = Control(0)
-        self._accept = Control(0)
-        self._quit = Control(0)
+    """Представляет физическое устройство ввода команд.
+
+    Состояние всех действий хранится в ActionMap. Шесть стандартных действий
+    доступны ещё и как контролы через свойства move_up, accept и т.д.
+    После опроса состояние можно зафиксировать в InputSnapshot через take_snapshot.
+    """
+    _snapshot: InputSnapshot | None = None
+
+    def __init__(self, extra_actions: Sequence[str] = ()):
+        """
+        Args:
+            extra_actions: Действия игры сверх стандартных DEFAULT_ACTIONS.
+        """
+        self._actions = ActionMap(DEFAULT_ACTIONS + tuple(extra_actions))
+        self._move_up = self._create_control('up', 0)
+        self._move_right = self._create_control('right', 0)
+        self._move_down = self._create_control('down', 0)
+        self._move_left = self._create_control('left', 0)
+        self._accept = self._create_control('accept', 0)
+        self._quit = self._create_control('quit', 0)
+
+    @property
+    def actions(self) -> ActionMap:
+        return self._actions
+
+    @property
+    def snapshot(self) -> InputSnapshot | None:
+        """Последний снимок, сделанный take_snapshot."""
+        return self._snapshot
+
+    def take_snapshot(self, frame: int) -> InputSnapshot:
+        """Фиксирует состояние действий после опроса.
+        Должен вызываться раз в кадр, чтобы нажатия считались от прошлого кадра.
+        """
+        self._snapshot = InputSnapshot.capture(
+            self._actions.flags, self._actions.values, frame, self._snapshot
+        )
+        return self._snapshot
 
     @property
     def move_right(self):
@@ -63,7 +227,9 @@ class Controller(ABC):
 
     @move_right.setter
     def move_right(self, value: Control):
+        value.attach(self._actions, self._actions.id_of('right'))
         self._move_right = value
+        self._on_controls_replaced()
 
     @property
     def move_left(self):
@@ -71,7 +237,9 @@ class Controller(ABC):
 
     @move_left.setter
     def move_left(self, value: Control):
+        value.attach(self._actions, self._actions.id_of('left'))
         self._move_left = value
+        self._on_controls_replaced()
 
     @property
     def move_up(self):
@@ -79,7 +247,9 @@ class Controller(ABC):
 
     @move_up.setter
     def move_up(self, value: Control):
+        value.attach(self._actions, self._actions.id_of('up'))
         self._move_up = value
+        self._on_controls_replaced()
 
     @property
     def move_down(self):
@@ -87,7 +257,9 @@ class Controller(ABC):
 
     @move_down.setter
     def move_down(self, value: Control):
+        value.attach(self._actions, self._actions.id_of('down'))
         self._move_down = value
+        self._on_controls_replaced()
 
     @property
     def accept(self):
@@ -97,73 +269,189 @@ class Controller(ABC):
     def quit(self):
         return self._quit
 
+    @property
+    def controls(self) -> tuple[Control, ...]:
+        return (
+            self._move_up,
+            self._move_right,
+            self._move_down,
+            self._move_left,
+            self._accept,
+            self._quit,
+        )
+
     @abstractmethod
     def conduct_survey_of_controls(self, events: list[pygame.event.Event]) -> None:
         '''Метод который нужно вызывать при каждой итерации игрового цикла
         чтобы понять какие котролы на контроллере были активированы.
-        Получение значений c физического устройства осуществляется только после
-        получения событий pygame.
+
+        Клавиатуры и геймпады читают состояние устройств из InputHub,
+        поэтому до опроса в этом кадре нужно вызвать input_hub.pump()
+        или input_hub.process_events(events). События, переданные сюда
+        без этого, такими контроллерами не учитываются.
+
+        Args:
+            events: События кадра, те же, что получил InputHub.
+            Нужны контроллерам, которые не читают InputHub.
         '''
         ...
 
+    def time_until_next_survey(self) -> float | None:
+        """Через сколько секунд контроллеру нужен следующий опрос,
+        даже если от устройств не придёт ни одного события.
+        None означает, что без событий опрос не нужен и окно может простаивать.
+        По умолчанию контроллер опрашивается каждый кадр.
+        """
+        return 0
+
+    def _create_control(self, action: str, key_number: int) -> Control:
+        return Control(key_number, self._actions, self._actions.id_of(action))
+
+    def _on_controls_replaced(self) -> None:
+        pass
+
     def deactivate_all_controls(self):
-        self._move_right.deactivate()
-        self._move_left.deactivate()
-        self._move_up.deactivate()
-        self._move_down.deactivate()
-        self._accept.deactivate()
-        self._quit.deactivate()
+        self._actions.reset()
 
 
 class PygameKeyboard(Controller):
-    def __init__(self, settings: ControllerSettings):
-        self._settings = settings
-        self._move_right = Control(settings.right.value)
-        self._move_up = Control(settings.up.value)
-        self._move_left = Control(settings.left.value)
-        self._move_down = Control(settings.down.value)
-        self._accept = Control(pygame.K_RETURN)
-        self._quit = Control(pygame.K_ESCAPE)
+    """Клавиатура, контролы которой активны, пока зажаты их клавиши.
+    Состояние клавиш берётся из общего InputHub, а назначения
+    из общих KeyBindings, поэтому переназначение клавиши в одном контроллере
+    сразу действует во всех остальных.
+    Все действия из KeyBindings, кроме стандартных, становятся
+    дополнительными действиями контроллера.
+    """
+    def __init__(self, bindings: KeyBindings, hub: InputHub = input_hub):
+        super().__init__(
+            [action for action in bindings.actions if action not in DEFAULT_ACTIONS]
+        )
+        self._bindings = bindings
+        self._input_hub = hub
+        self._move_right = self._create_control('right', bindings.get_key('right'))
+        self._move_up = self._create_control('up', bindings.get_key('up'))
+        self._move_left = self._create_control('left', bindings.get_key('left'))
+        self._move_down = self._create_control('down', bindings.get_key('down'))
+        self._accept = self._create_control('accept', bindings.get_key('accept'))
+        self._quit = self._create_control('quit', bindings.get_key('quit'))
+        self._controls_by_action: dict[str, Control] = {}
+        self._bind_controls()
+        self._compile_key_table()
+        bindings.changed_handlers.append(self._on_binding_changed)
 
     def conduct_survey_of_controls(self, events) -> None:
-        keys = pygame.key.get_pressed()
-        if keys[self._move_right.key_number]:
-            self._move_right.activate()
-        if keys[self._move_left.key_number]:
-            self._move_left.activate()
-        if keys[self._move_up.key_number]:
-            self._move_up.activate()
-        if keys[self._move_down.key_number]:
-            self._move_down.activate()
-        if keys[self._accept.key_number]:
-            self._accept.activate()
-        if keys[self._quit.key_number]:
-            self._quit.activate()
+        flags = self._actions.flags
+        values = self._actions.values
+        table = self._action_ids_by_key
+        for key_number in self._input_hub.held_keys:
+            for action_id in table.get(key_number, ()):
+                flags[action_id] = 1
+                values[action_id] = 1
+
+    def time_until_next_survey(self) -> float | None:
+        # Пока назначенная клавиша зажата, контрол активен в каждом кадре.
+        table = self._action_ids_by_key
+        for key_number in self._input_hub.held_keys:
+            if key_number in table:
+                return 0
+        return None
+
+    def _compile_key_table(self) -> None:
+        """Строит таблицу клавиша -> номера действий в карте этого контроллера."""
+        table: dict[int, list[int]] = {}
+        for action in self._bindings.actions:
+            if action not in self._actions:
+                continue
+            key_number = self._bindings.get_key(action)
+            table.setdefault(key_number, []).append(self._actions.id_of(action))
+        self._action_ids_by_key = {
+            key_number: tuple(action_ids)
+            for key_number, action_ids
+            in table.items()
+        }
+
+    def _bind_controls(self) -> None:
+        """Связывает новые контролы с KeyBindings.
+        Клавиша контрола, подставленного через свойство, становится назначением.
+        """
+        previous = self._controls_by_action
+        self._controls_by_action = {
+            'up': self._move_up,
+            'right': self._move_right,
+            'down': self._move_down,
+            'left': self._move_left,
+            'accept': self._accept,
+            'quit': self._quit,
+        }
+        for action, control in self._controls_by_action.items():
+            if previous.get(action) is control:
+                continue
+            control.add_key_number_changed_handler(
+                lambda control, action=action: self._bindings.bind(
+                    action, control.key_number
+                )
+            )
+            self._bindings.bind(action, control.key_number)
+
+    def _on_controls_replaced(self) -> None:
+        self._bind_controls()
+        self._compile_key_table()
+
+    def _on_binding_changed(self, action: str, key_number: int) -> None:
+        self._compile_key_table()
+        control = self._controls_by_action.get(action)
+        if control is not None and control.key_number != key_number:
+            control.update_key_number(key_number)
 
     def __str__(self):
         return "Keyboard"
 
 
 class PygameIntermittentKeyboard(PygameKeyboard):
-    def __init__(self, settings: ControllerSettings):
-        super().__init__(settings)
+    """Клавиатура, контролы которой срабатывают при нажатии клавиши,
+    а при удержании повторяются через промежутки, заданные AutoRepeat.
+    """
+    def __init__(
+            self,
+            bindings: KeyBindings,
+            hub: InputHub = input_hub,
+            repeat: AutoRepeat | None = None):
+        """
+        Args:
+            repeat: Расписание повторов. У каждого контроллера должно быть своё.
+        """
+        super().__init__(bindings, hub)
+        self._repeat = repeat or AutoRepeat()
 
     def conduct_survey_of_controls(self, events) -> None:
-        for event in events:
-            if event.type != pygame.KEYDOWN:
-                continue
-            if self._move_right.key_number == event.key:
-                self._move_right.activate()
-            elif self._move_left.key_number == event.key:
-                self._move_left.activate()
-            elif self._move_up.key_number == event.key:
-                self._move_up.activate()
-            elif self._move_down.key_number == event.key:
-                self._move_down.activate()
-            if self._accept.key_number == event.key:
-                self._accept.activate()
-            elif self._quit.key_number == event.key:
-                self._quit.activate()
+        table = self._action_ids_by_key
+        held_ids: set[int] = set()
+        for key_number in self._input_hub.held_keys:
+            held_ids.update(table.get(key_number, ()))
+        pressed_ids: set[int] = set()
+        for key_number in self._input_hub.pressed_keys:
+            pressed_ids.update(table.get(key_number, ()))
+
+        repeat = self._repeat
+        now = repeat.now()
+        actions = self._actions
+        # Остальные действия не нажаты и не ждут повтора, их обходить незачем.
+        action_ids = pressed_ids | held_ids
+        action_ids.update(repeat.tracked_keys)  # type: ignore
+        for action_id in action_ids:
+            # Клавиша могла быть нажата и отпущена за один кадр,
+            # поэтому нажатие проверяется отдельно от удержания.
+            if action_id in pressed_ids:
+                fired = repeat.press(action_id, now)
+            else:
+                fired = repeat.update(
+                    action_id, action_id in held_ids, now, start_on_hold=False
+                )
+            if fired:
+                actions.activate(action_id)
+
+    def time_until_next_survey(self) -> float | None:
+        return self._repeat.time_until_next(self._repeat.now())
 
     def __str__(self):
         return "Intermittent Keyboard"
@@ -192,53 +480,115 @@ class GamePadButton(Enum):
 
 
 class PygameGamepad(Controller):
-    def __init__(self):
+    def __init__(
+            self,
+            game_pad: pygame.joystick.JoystickType | None = None,
+            hub: InputHub = input_hub,
+            stick_processor: StickProcessor | None = None):
+        """
+        Args:
+            game_pad: Устройство, которое опрашивает контроллер.
+            Если не указано, то берётся первый подключённый геймпад,
+            а если геймпадов нет, то контроллер ничего не активирует.
+            Для подключения геймпадов на ходу есть GamepadManager.
+            hub: Источник состояния устройства, снятого один раз за кадр.
+            stick_processor: Обработка значений левого стика,
+            по умолчанию радиальная мёртвая зона 0.05.
+            Направление при этом включается, только если наклон по его оси
+            тоже вышел из мёртвой зоны.
+        """
         # Конструктор должен принимать геймпад, потому что играть можно на нескольких
         # геймпадах одновременно.
-        self._game_pad = [
-            pygame.joystick.Joystick(x)
-            for x
-            in range(pygame.joystick.get_count())
-        ][0]
-        self._dead_zone = 0.05
-        self._move_up = Control(GamePadAxe.LEFT_STICK_Y.value)
-        self._move_right = Control(GamePadAxe.LEFT_STICK_X.value)
-        self._move_down = Control(GamePadAxe.LEFT_STICK_Y.value)
-        self._move_left = Control(GamePadAxe.LEFT_STICK_X.value)
-        self._accept = Control(GamePadButton.A.value)
-        self._quit = Control(GamePadButton.B.value)
+        super().__init__()
+        if game_pad is None and pygame.joystick.get_count():
+            game_pad = pygame.joystick.Joystick(0)
+        self._game_pad = game_pad
+        self._input_hub = hub
+        # Состояние обновляет hub по событиям, контроллер только читает его.
+        self._state = hub.get_joystick_state(game_pad) if game_pad is not None else None
+        self._stick_processor = stick_processor or StickProcessor()
+        self._stick = (0.0, 0.0)
+        self._stick_frame = -1
+        self._move_up = self._create_control('up', GamePadAxe.LEFT_STICK_Y.value)
+        self._move_right = self._create_control('right', GamePadAxe.LEFT_STICK_X.value)
+        self._move_down = self._create_control('down', GamePadAxe.LEFT_STICK_Y.value)
+        self._move_left = self._create_control('left', GamePadAxe.LEFT_STICK_X.value)
+        self._accept = self._create_control('accept', GamePadButton.A.value)
+        self._quit = self._create_control('quit', GamePadButton.B.value)
 
-    def deactivate_all_controls(self):
-        self._deactivate_axes()
-        self._deactivate_buttons()
+    @property
+    def connected(self) -> bool:
+        return self._state is not None and self._state.connected
+
+    @property
+    def stick_processor(self) -> StickProcessor:
+        return self._stick_processor
 
-    def _deactivate_axes(self):
-        self._move_up.deactivate()
-        self._move_right.deactivate()
-        self._move_down.deactivate()
-        self._move_left.deactivate()
+    @property
+    def raw_stick(self) -> tuple[float, float]:
+        """Необработанные значения осей x и y левого стика."""
+        if self._state is None:
+            return 0.0, 0.0
+        axes = self._state.axes
+        return axes[GamePadAxe.LEFT_STICK_X.value], axes[GamePadAxe.LEFT_STICK_Y.value]
+
+    def set_stick(self, x: float, y: float) -> None:
+        """Задаёт обработанные значения стика на текущий кадр.
+        Используется, когда стики всех геймпадов обрабатываются разом,
+        тогда при опросе контроллер не обрабатывает стик повторно.
+        """
+        self._stick = (x, y)
+        self._stick_frame = self._input_hub.frame
 
-    def _deactivate_buttons(self):
-        self._accept.deactivate()
-        self._quit.deactivate()
+    def disconnect(self) -> None:
+        """Отвязывает контроллер от отключённого устройства."""
+        self._game_pad = None
+        self._state = None
+        self.deactivate_all_controls()
 
     def conduct_survey_of_controls(self, events) -> None:
+        if self._state is None:
+            return
+        if not self._state.connected:
+            # Устройство отключили, а GamepadManager, который сделал бы это, не задан.
+            self.disconnect()
+            return
+        raw_x, raw_y = self.raw_stick
+        if self._stick_frame != self._input_hub.frame:
+            self.set_stick(*self._stick_processor.process(raw_x, raw_y))
+        x, y = self._stick
+        # При радиальной мёртвой зоне дрожание стика поперёк наклона
+        # проходит в обработанное значение и включало бы соседнее направление.
+        dead_zone = self._stick_processor.dead_zone
+        if abs(raw_x) <= dead_zone:
+            x = 0.0
+        if abs(raw_y) <= dead_zone:
+            y = 0.0
         self._try_to_activate_stick_directions(
-            axe=GamePadAxe.LEFT_STICK_X,
+            value=x,
             positive_direction=self._move_right,
             negative_direction=self._move_left
         )
         self._try_to_activate_stick_directions(
-            axe=GamePadAxe.LEFT_STICK_Y,
+            value=y,
             positive_direction=self._move_down,
             negative_direction=self._move_up
         )
         self._try_to_activate_button(self._accept)
         self._try_to_activate_button(self._quit)
 
+    def time_until_next_survey(self) -> float | None:
+        if self._state is None:
+            return None
+        # Наклонённый стик или зажатая кнопка не присылают событий,
+        # но контролы должны быть активны в каждом кадре.
+        if any(self._stick) or any(self._state.buttons):
+            return 0
+        return None
+
     def _try_to_activate_stick_directions(
         self,
-        axe: GamePadAxe,
+        value: float,
         positive_direction: Control,
         negative_direction: Control
     ) -> None:
@@ -246,86 +596,67 @@ class PygameGamepad(Controller):
         если стик физического устройства был активирован.
 
         Args:
-            axe: Одна из осей стика.
+            value: Обработанное значение оси, в мёртвой зоне оно равно нулю.
             positive_direction: Элемент управления контроллера,
             отвечающий за позитивное направление выбранной оси.
             negative_direction: Элемент управления контроллера,
             отвечающий за отрицательное направление выбранной оси.
         """
-        value = self._game_pad.get_axis(axe.value)
         if not value:
             return
 
-        if abs(value) <= self._dead_zone:
-            return
-
         if value > 0:
             positive_direction.activate(value)
         else:
             negative_direction.activate(value)
 
     def _try_to_activate_button(self, button: Control) -> None:
-        if self._game_pad.get_button(button.key_number):
+        if self._state.buttons[button.key_number]:  # type: ignore
             button.activate()
 
     def __str__(self):
+        if self._game_pad is None:
+            return "No gamepad"
         return self._game_pad.get_name()
 
 
 class PygameIntermittentGamepad(PygameGamepad):
-    def __init__(self):
-        super().__init__()
-        self._max_intermittent_frames = 30
-        self._current_frame = 0
-
-    def deactivate_axes(self):
-        """В данном классе деактивацией осей занимается другой метод
-        """
-        pass
+    """Геймпад, контролы которого срабатывают при наклоне стика или нажатии кнопки,
+    а при удержании повторяются через промежутки, заданные AutoRepeat.
+    Каждое направление стика и каждая кнопка повторяются независимо.
+    """
+    def __init__(
+            self,
+            game_pad: pygame.joystick.JoystickType | None = None,
+            hub: InputHub = input_hub,
+            repeat: AutoRepeat | None = None,
+            stick_processor: StickProcessor | None = None):
+        super().__init__(game_pad, hub, stick_processor)
+        self._repeat = repeat or AutoRepeat()
+        self._now = 0.0
 
     def conduct_survey_of_controls(self, events) -> None:
+        self._now = self._repeat.now()
         super().conduct_survey_of_controls(events)
 
     def _try_to_activate_stick_directions(
         self,
+        value: float,
         positive_direction: Control,
-        negative_direction: Control,
-        axe: GamePadAxe
+        negative_direction: Control
     ) -> None:
-        """Стик должен активироваться единожды, даже если на физическом устройстве его
-        продолжают нажимать.
-        Через некоторое количество кадров он должен снова активироваться на один кадр.
-        Если на физическом устройстве его деактивировали, то счётчик кадров должен
-        сбросится и следующая активация физ устройства должна активировать стик.
-        """
-        value = self._game_pad.get_axis(axe.value)
-
-        if self._current_frame > 0:
-            positive_direction.deactivate()
-            negative_direction.deactivate()
-            # Тут есть проблема.
-            # Тут хорошо было бы проверить силу нажатия и если она меньше мёртвой зоны,
-            # то обнулить фреймы, чтобы счёт фреймов прекратился
-            # и можно было бы тут же использовать стик ещё раз,
-            # но так как здесь же проверяется вторая ось, то она может скинуть фреймы,
-            # в тот момент когда для первой оси это не нужно.
-            # Пример: X = 1, Y = 0.
-            # Активируем счётчик фреймов, но проверка нажатия оси Y сбросит его.
-        else:
-            if abs(value) <= self._dead_zone:
-                positive_direction.deactivate()
-                negative_direction.deactivate()
-                self._current_frame = 0
-                return
-
-            if value > 0:
-                positive_direction.activate(value)
-            else:
-                negative_direction.activate(value)
+        if self._repeat.update(positive_direction, value > 0, self._now):
+            positive_direction.activate(value)
+        if self._repeat.update(negative_direction, value < 0, self._now):
+            negative_direction.activate(value)
 
-        self._current_frame += 1
-        if self._current_frame == self._max_intermittent_frames:
-            self._current_frame = 0
+    def time_until_next_survey(self) -> float | None:
+        return self._repeat.time_until_next(self._repeat.now())
+
+    def _try_to_activate_button(self, button: Control) -> None:
+        pressed = self._state.buttons[button.key_number]  # type: ignore
+        if self._repeat.update(button, pressed, self._now):
+            button.activate()
 
     def __str__(self):
         return f"Intermittent {super().__str__()}"
@@ -1,19 +1,300 @@
-from .model import Character, Point
+import math
+from typing import Callable, Hashable, Iterable
+
+import numpy as np
+
+from .model import Character, Obstacle, Population
 from .controllers import Controller
 
+CollisionHandler = Callable[[Character, Character | Obstacle], None]
+
+
+class SpatialHash:
+    """Равномерная сетка, в каждой ячейке которой лежат объекты,
+    задевающие её своим прямоугольником.
+
+    Запрос по области просматривает только её ячейки,
+    поэтому его стоимость зависит от плотности объектов рядом, а не от их числа.
+    """
+    def __init__(self, cell_size: float = 128):
+        self._cell_size = cell_size
+        self._cells: dict[tuple[int, int], set] = {}
+        # объект -> диапазон занятых ячеек (x0, y0, x1, y1) включительно
+        self._ranges: dict[Hashable, tuple[int, int, int, int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._ranges)
+
+    def __contains__(self, item: Hashable) -> bool:
+        return item in self._ranges
+
+    @property
+    def cell_size(self) -> float:
+        return self._cell_size
+
+    def insert(
+            self,
+            item: Hashable,
+            left: float,
+            top: float,
+            width: float,
+            height: float) -> None:
+        cells = self._get_range(left, top, width, height)
+        self._ranges[item] = cells
+        self._add_to_cells(item, cells)
+
+    def move(
+            self,
+            item: Hashable,
+            left: float,
+            top: float,
+            width: float,
+            height: float) -> None:
+        """Обновляет положение объекта.
+        Пока он не пересёк границу ячейки, сетка не меняется.
+        """
+        cells = self._get_range(left, top, width, height)
+        old_cells = self._ranges[item]
+        if cells == old_cells:
+            return
+        self._remove_from_cells(item, old_cells)
+        self._ranges[item] = cells
+        self._add_to_cells(item, cells)
+
+    def remove(self, item: Hashable) -> None:
+        self._remove_from_cells(item, self._ranges.pop(item))
+
+    def query(self, left: float, top: float, width: float, height: float) -> set:
+        """Объекты из ячеек, которые задевает прямоугольник.
+        Точное пересечение с ним нужно проверять отдельно.
+        """
+        x0, y0, x1, y1 = self._get_range(left, top, width, height)
+        cells = self._cells
+        if x0 == x1 and y0 == y1:
+            return set(cells.get((x0, y0), ()))
+
+        found = set()
+        for x in range(x0, x1 + 1):
+            for y in range(y0, y1 + 1):
+                items = cells.get((x, y))
+                if items:
+                    found |= items
+        return found
+
+    def _get_range(
+            self,
+            left: float,
+            top: float,
+            width: float,
+            height: float) -> tuple[int, int, int, int]:
+        size = self._cell_size
+        x0 = math.floor(left / size)
+        y0 = math.floor(top / size)
+        # Правая и нижняя границы прямоугольника ему не принадлежат.
+        x1 = max(x0, math.ceil((left + width) / size) - 1)
+        y1 = max(y0, math.ceil((top + height) / size) - 1)
+        return x0, y0, x1, y1
+
+    def _add_to_cells(self, item: Hashable, cells: tuple[int, int, int, int]) -> None:
+        x0, y0, x1, y1 = cells
+        for x in range(x0, x1 + 1):
+            for y in range(y0, y1 + 1):
+                self._cells.setdefault((x, y), set()).add(item)
+
+    def _remove_from_cells(
+            self,
+            item: Hashable,
+            cells: tuple[int, int, int, int]) -> None:
+        x0, y0, x1, y1 = cells
+        for x in range(x0, x1 + 1):
+            for y in range(y0, y1 + 1):
+                items = self._cells[(x, y)]
+                items.discard(item)
+                if not items:
+                    del self._cells[(x, y)]
+
+
+class _Body:
+    """Прямоугольник персонажа или препятствия в мире столкновений."""
+    __slots__ = ('owner', 'left', 'top', 'width', 'height')
+
+    def __init__(
+            self,
+            owner: Character | Obstacle,
+            left: float,
+            top: float,
+            width: float,
+            height: float):
+        self.owner = owner
+        self.left = left
+        self.top = top
+        self.width = width
+        self.height = height
+
+    def overlaps(self, left: float, top: float, width: float, height: float) -> bool:
+        # Касание краями пересечением не считается.
+        return (
+            self.left < left + width and left < self.left + self.width
+            and self.top < top + height and top < self.top + self.height
+        )
+
+
+class CollisionWorld:
+    """Границы мира, препятствия и столкновения персонажей между собой.
+
+    Персонажи и препятствия лежат в одной SpatialHash, которая обновляется
+    при каждом перемещении, поэтому перемещение проверяется только
+    с соседями, и тик обходится линейно по числу персонажей.
+    """
+    def __init__(self, width: float, height: float, cell_size: float = 128):
+        """
+        Args:
+            width: Ширина мира, левая граница в нуле.
+            height: Высота мира, верхняя граница в нуле.
+            cell_size: Сторона ячейки сетки. Лучше брать не меньше размера
+            типичного персонажа.
+        """
+        self._width = width
+        self._height = height
+        self._grid = SpatialHash(cell_size)
+        self._characters: dict[Character, _Body] = {}
+        # Вызываются с персонажем и тем, во что он упёрся:
+        # другим персонажем или препятствием.
+        self.collision_handlers: list[CollisionHandler] = []
+
+    @property
+    def size(self) -> tuple[float, float]:
+        return self._width, self._height
+
+    @property
+    def grid(self) -> SpatialHash:
+        return self._grid
+
+    def add_obstacle(self, obstacle: Obstacle) -> None:
+        body = _Body(
+            obstacle, obstacle.left, obstacle.top, obstacle.width, obstacle.height
+        )
+        self._grid.insert(body, body.left, body.top, body.width, body.height)
+
+    def add_character(self, character: Character, width: float, height: float) -> None:
+        """Помещает персонажа в мир там, где он стоит.
+        Размер отсчитывается от его координат, как у спрайта.
+        """
+        location = character.location
+        body = _Body(character, location.x, location.y, width, height)
+        self._characters[character] = body
+        self._grid.insert(body, body.left, body.top, width, height)
+
+    def remove_character(self, character: Character) -> None:
+        self._grid.remove(self._characters.pop(character))
+
+    def get_overlapping(self, character: Character) -> list[Character | Obstacle]:
+        """Всё, с чем персонаж сейчас пересекается."""
+        body = self._characters[character]
+        return [
+            other.owner
+            for other
+            in self._get_neighbours(body, body.left, body.top, body.width, body.height)
+        ]
+
+    def move_character(self, character: Character, x: float, y: float) -> None:
+        """Перемещает персонажа в сторону точки настолько, насколько пускают
+        границы мира, препятствия и другие персонажи.
+
+        Движение проверяется сначала по горизонтали, затем по вертикали,
+        поэтому вдоль стены персонаж скользит, а не останавливается.
+        То, с чем персонаж пересекался ещё до движения, его не задерживает,
+        чтобы он мог выйти из наложения.
+        """
+        body = self._characters[character]
+        x = min(max(x, 0), self._width - body.width)
+        y = min(max(y, 0), self._height - body.height)
+
+        body.left = self._move_horizontally(body, x)
+        body.top = self._move_vertically(body, y)
+        character.move_to_coordinates(body.left, body.top)
+        self._grid.move(body, body.left, body.top, body.width, body.height)
+
+    def _move_horizontally(self, body: _Body, x: float) -> float:
+        if x == body.left:
+            return x
+        # Проверяется вся пройденная полоса, чтобы быстрый персонаж
+        # не проскакивал сквозь тонкие препятствия.
+        left = min(x, body.left)
+        width = abs(x - body.left) + body.width
+        blocker = None
+        for other in self._get_neighbours(body, left, body.top, width, body.height):
+            if other.overlaps(body.left, body.top, body.width, body.height):
+                continue
+            if x > body.left:
+                limit = other.left - body.width
+                if limit < x:
+                    x, blocker = limit, other
+            else:
+                limit = other.left + other.width
+                if limit > x:
+                    x, blocker = limit, other
+        if blocker is not None:
+            self._notify(body, blocker)
+        return x
+
+    def _move_vertically(self, body: _Body, y: float) -> float:
+        if y == body.top:
+            return y
+        top = min(y, body.top)
+        height = abs(y - body.top) + body.height
+        blocker = None
+        for other in self._get_neighbours(body, body.left, top, body.width, height):
+            if other.overlaps(body.left, body.top, body.width, body.height):
+                continue
+            if y > body.top:
+                limit = other.top - body.height
+                if limit < y:
+                    y, blocker = limit, other
+            else:
+                limit = other.top + other.height
+                if limit > y:
+                    y, blocker = limit, other
+        if blocker is not None:
+            self._notify(body, blocker)
+        return y
+
+    def _get_neighbours(
+            self,
+            body: _Body,
+            left: float,
+            top: float,
+            width: float,
+            height: float) -> Iterable[_Body]:
+        for other in self._grid.query(left, top, width, height):
+            if other is not body and other.overlaps(left, top, width, height):
+                yield other
+
+    def _notify(self, body: _Body, blocker: _Body) -> None:
+        for handler in self.collision_handlers:
+            handler(body.owner, blocker.owner)  # type: ignore
+
 
 class Mover:
-    def __init__(self, controller: Controller):
+    def __init__(self, controller: Controller, world: CollisionWorld | None = None):
+        """
+        Args:
+            controller: Контроллер, по которому двигается персонаж.
+            world: Если задан, персонаж двигается с учётом его границ и столкновений
+            и должен быть в него добавлен.
+        """
         self._controller = controller
+        self._world = world
 
     def move_character(self, character: Character):
         speed = 0
-        character.move_to(
-            Point(
-                x=self._get_new_x(character.location.x, speed),
-                y=self._get_new_y(character.location.y, speed)
-            )
-        )
+        location = character.location
+        x = self._get_new_x(location.x, speed)
+        y = self._get_new_y(location.y, speed)
+        if self._world is not None:
+            self._world.move_character(character, x, y)
+        else:
+            character.move_to_coordinates(x, y)
 
     def _get_new_x(self, start_x: float, speed: float) -> float:
         if self._controller.move_right.activated:
@@ -28,3 +309,32 @@ class Mover:
         if self._controller.move_down.activated:
             return start_y + self._controller.move_down.value + speed
         return start_y
+
+
+class BatchMover(Mover):
+    """Применяет ввод с контроллера сразу ко всей популяции персонажей.
+    Одиночных персонажей двигает так же, как Mover.
+    Если задан мир, координаты популяции не выходят за его границы,
+    но с препятствиями и друг с другом её персонажи не сталкиваются.
+    """
+    def __init__(self, controller: Controller, world: CollisionWorld | None = None):
+        super().__init__(controller, world)
+        self._direction = np.zeros(2, dtype=np.float64)
+
+    def move_population(self, population: Population) -> None:
+        positions = population.positions
+        positions += population.velocities
+
+        self._direction[0] = self._get_new_x(0, 0)
+        self._direction[1] = self._get_new_y(0, 0)
+        if self._direction.any():
+            scratch = population.scratch
+            np.multiply(
+                population.control_weights[:, np.newaxis], self._direction, out=scratch
+            )
+            positions += scratch
+
+        if self._world is not None:
+            width, height = self._world.size
+            np.clip(positions[:, 0], 0, width, out=positions[:, 0])
+            np.clip(positions[:, 1], 0, height, out=positions[:, 1])
@@ -0,0 +1,118 @@
+from typing import Callable
+
+import numpy as np
+import pygame
+
+from .axes import StickProcessor
+from .controllers import PygameGamepad
+from .input_hub import InputHub, input_hub
+
+
+MAX_GAMEPADS = 8
+# С меньшим количеством геймпадов накладные расходы numpy больше выигрыша,
+# и стики дешевле обработать по одному при опросе контроллеров.
+BATCH_MIN_GAMEPADS = 32
+
+
+class GamepadManager:
+    """Следит за подключением и отключением геймпадов во время игры
+    и держит по контроллеру на каждый подключённый геймпад.
+
+    Геймпады различаются по instance id, который SDL выдаёт при подключении
+    и не переиспользует, поэтому переподключённый геймпад получает новый контроллер.
+    Уже подключённые при запуске геймпады приходят теми же событиями
+    JOYDEVICEADDED в первом кадре.
+    """
+    def __init__(
+            self,
+            controller_factory: Callable[..., PygameGamepad] = PygameGamepad,
+            max_gamepads: int = MAX_GAMEPADS,
+            hub: InputHub = input_hub,
+            stick_processor: StickProcessor | None = None):
+        """
+        Args:
+            controller_factory: Создаёт контроллер по геймпаду, InputHub
+            и stick_processor, например PygameGamepad или PygameIntermittentGamepad.
+            max_gamepads: Сколько геймпадов обслуживать одновременно,
+            лишние игнорируются, пока не освободится место.
+            hub: InputHub, с событиями которого работает менеджер.
+            stick_processor: Обработка стиков, общая для всех геймпадов.
+        """
+        self._controller_factory = controller_factory
+        self._max_gamepads = max_gamepads
+        self._input_hub = hub
+        self._stick_processor = stick_processor or StickProcessor()
+        self._joysticks: dict[int, pygame.joystick.JoystickType] = {}
+        self._controllers: dict[int, PygameGamepad] = {}
+        # Индексы устройств, на которые не хватило места.
+        self._waiting_device_indexes: list[int] = []
+        self.added_handlers: list[Callable[[int, PygameGamepad], None]] = []
+        self.removed_handlers: list[Callable[[int, PygameGamepad], None]] = []
+        hub.frame_handlers.append(self.process_events)
+
+    @property
+    def controllers(self) -> list[PygameGamepad]:
+        """Контроллеры в порядке подключения геймпадов."""
+        return list(self._controllers.values())
+
+    def get_controller(self, instance_id: int) -> PygameGamepad | None:
+        return self._controllers.get(instance_id)
+
+    def process_events(self, events: list[pygame.event.Event]) -> None:
+        """Обрабатывает подключения и отключения геймпадов,
+        затем, если геймпадов много, обрабатывает их стики одним проходом.
+        Вызывается InputHub в каждом кадре.
+        """
+        for event in events:
+            if event.type == pygame.JOYDEVICEADDED:
+                self._add(event.device_index)
+            elif event.type == pygame.JOYDEVICEREMOVED:
+                self._remove(event.instance_id)
+        self._process_sticks()
+
+    def _process_sticks(self) -> None:
+        controllers = self._controllers.values()
+        if len(controllers) < BATCH_MIN_GAMEPADS:
+            return
+        sticks = np.array(
+            [controller.raw_stick for controller in controllers], dtype=np.float64
+        )
+        processed = self._stick_processor.process_many(sticks)
+        for controller, (x, y) in zip(controllers, processed.tolist()):
+            controller.set_stick(x, y)
+
+    def _add(self, device_index: int) -> None:
+        joystick = pygame.joystick.Joystick(device_index)
+        instance_id = joystick.get_instance_id()
+        if instance_id in self._joysticks:
+            return
+        if len(self._joysticks) >= self._max_gamepads:
+            self._waiting_device_indexes.append(device_index)
+            return
+
+        # Начальное состояние снимается сразу, дальше его обновляют события.
+        self._input_hub.get_joystick_state(joystick)
+        controller = self._controller_factory(
+            joystick, self._input_hub, stick_processor=self._stick_processor
+        )
+        self._joysticks[instance_id] = joystick
+        self._controllers[instance_id] = controller
+        for handler in self.added_handlers:
+            handler(instance_id, controller)
+
+    def _remove(self, instance_id: int) -> None:
+        joystick = self._joysticks.pop(instance_id, None)
+        if joystick is None:
+            return
+        controller = self._controllers.pop(instance_id)
+        # Состояние устройства InputHub уже забыл, обработав это же событие.
+        controller.disconnect()
+        for handler in self.removed_handlers:
+            handler(instance_id, controller)
+
+        # Индексы устройств сдвигаются при отключении,
+        # поэтому ожидающие геймпады ищутся заново по всем подключённым.
+        if self._waiting_device_indexes:
+            self._waiting_device_indexes.clear()
+            for device_index in range(pygame.joystick.get_count()):
+                self._add(device_index)
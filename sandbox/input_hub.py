@@ -0,0 +1,159 @@
+from typing import Callable
+
+import pygame
+
+
+class JoystickState:
+    """Последние известные значения осей и кнопок одного джойстика.
+
+    Устройство опрашивается целиком только при создании состояния,
+    дальше значения меняются лишь событиями JOYAXISMOTION, JOYBUTTONDOWN
+    и JOYBUTTONUP. После отключения устройства все значения нулевые.
+    """
+    def __init__(self, joystick: pygame.joystick.JoystickType):
+        self.axes = [joystick.get_axis(i) for i in range(joystick.get_numaxes())]
+        self.buttons = [
+            bool(joystick.get_button(i))
+            for i
+            in range(joystick.get_numbuttons())
+        ]
+        self.connected = True
+
+    def disconnect(self) -> None:
+        self.axes = [0.0] * len(self.axes)
+        self.buttons = [False] * len(self.buttons)
+        self.connected = False
+
+    def set_axis(self, axis: int, value: float) -> None:
+        if axis < len(self.axes):
+            self.axes[axis] = value
+
+    def set_button(self, button: int, pressed: bool) -> None:
+        if button < len(self.buttons):
+            self.buttons[button] = pressed
+
+
+class InputHub:
+    """Единственное место, где опрашиваются устройства ввода.
+
+    Раз в кадр забирает события pygame и обновляет по ним состояние клавиатуры
+    и джойстиков. Контроллеры только читают это состояние, поэтому сколько бы
+    их ни было, к SDL обращаются лишь за изменившимися элементами управления.
+    """
+    def __init__(self):
+        self._events: list[pygame.event.Event] = []
+        # События, полученные в wait, достаются следующему pump.
+        self._waited_events: list[pygame.event.Event] = []
+        self._held_keys: set[int] = set()
+        self._pressed_keys: list[int] = []
+        self._frame = 0
+        self._joysticks: dict[int, JoystickState] = {}
+        # Вызываются в конце каждого кадра с его событиями,
+        # например, чтобы отследить подключение устройств.
+        self.frame_handlers: list[Callable[[list[pygame.event.Event]], None]] = []
+
+    @property
+    def frame(self) -> int:
+        """Номер текущего кадра, увеличивается при каждом pump."""
+        return self._frame
+
+    @property
+    def events(self) -> list[pygame.event.Event]:
+        return self._events
+
+    @property
+    def held_keys(self) -> set[int]:
+        """Клавиши, которые сейчас зажаты."""
+        return self._held_keys
+
+    @property
+    def pressed_keys(self) -> list[int]:
+        """Клавиши, нажатые в этом кадре."""
+        return self._pressed_keys
+
+    def pump(self) -> list[pygame.event.Event]:
+        """Должен вызываться один раз в начале каждого кадра."""
+        events = pygame.event.get()
+        if self._waited_events:
+            events = self._waited_events + events
+            self._waited_events = []
+        self.process_events(events)
+        return events
+
+    def wait(self, timeout_ms: int) -> bool:
+        """Блокирует поток, пока не придёт событие или не пройдёт timeout_ms.
+        Пришедшее событие не теряется, его вернёт следующий pump.
+
+        Returns:
+            True, если событие пришло.
+        """
+        if self._waited_events:
+            return True
+        if timeout_ms <= 0:
+            return False
+        event = pygame.event.wait(timeout_ms)
+        if event.type == pygame.NOEVENT:
+            return False
+        self._waited_events.append(event)
+        return True
+
+    def process_events(self, events: list[pygame.event.Event]) -> None:
+        """Начинает новый кадр с уже полученными событиями."""
+        pressed_keys = []
+        # Стик за кадр может прислать десятки JOYAXISMOTION,
+        # важно только последнее значение каждой оси.
+        axes: dict[tuple[int, int], float] = {}
+        removed_joysticks = []
+        for event in events:
+            if event.type == pygame.JOYAXISMOTION:
+                axes[event.instance_id, event.axis] = event.value
+            elif event.type == pygame.KEYDOWN:
+                # Повторы от pygame.key.set_repeat нажатиями не считаются.
+                if event.key not in self._held_keys:
+                    self._held_keys.add(event.key)
+                    pressed_keys.append(event.key)
+            elif event.type == pygame.KEYUP:
+                self._held_keys.discard(event.key)
+            elif event.type in (pygame.JOYBUTTONDOWN, pygame.JOYBUTTONUP):
+                state = self._joysticks.get(event.instance_id)
+                if state is not None:
+                    state.set_button(event.button, event.type == pygame.JOYBUTTONDOWN)
+            elif event.type == pygame.JOYDEVICEREMOVED:
+                removed_joysticks.append(event.instance_id)
+            elif event.type == pygame.WINDOWFOCUSLOST:
+                self._held_keys.clear()
+        for (instance_id, axis), value in axes.items():
+            state = self._joysticks.get(instance_id)
+            if state is not None:
+                state.set_axis(axis, value)
+        # Иначе стик, отключённый наклонённым, остался бы наклонённым навсегда.
+        for instance_id in removed_joysticks:
+            self.forget_joystick(instance_id)
+        self._events = events
+        self._pressed_keys = pressed_keys
+        self._frame += 1
+        for handler in self.frame_handlers:
+            handler(events)
+
+    def get_joystick_state(self, joystick: pygame.joystick.JoystickType) -> JoystickState:
+        """Возвращает состояние джойстика в текущем кадре.
+        Устройство опрашивается только при первом обращении,
+        после этого состояние обновляется событиями.
+        """
+        instance_id = joystick.get_instance_id()
+        state = self._joysticks.get(instance_id)
+        if state is None:
+            state = JoystickState(joystick)
+            self._joysticks[instance_id] = state
+        return state
+
+    def forget_joystick(self, instance_id: int) -> None:
+        """Удаляет состояние отключённого джойстика.
+        Контроллеры, которые ещё держат это состояние, видят его обнулённым.
+        """
+        state = self._joysticks.pop(instance_id, None)
+        if state is not None:
+            state.disconnect()
+
+
+input_hub = InputHub()
@@ -1,16 +1,125 @@
+import numpy as np
+
+
 class Point:
+    __slots__ = ('x', 'y')
+
     def __init__(self, x: float = 0, y: float = 0):
         self.x = x
         self.y = y
 
 
 class Character:
+    """Персонаж владеет своей точкой и перемещается, изменяя её на месте,
+    чтобы движение каждый кадр не создавало новых объектов.
+    """
+    __slots__ = ('_location',)
+
     def __init__(self, start_point: Point):
-        self._location = start_point
+        self._location = Point(start_point.x, start_point.y)
 
     @property
     def location(self) -> Point:
         return self._location
 
     def move_to(self, point: Point) -> None:
-        self._location = point
+        self.move_to_coordinates(point.x, point.y)
+
+    def move_to_coordinates(self, x: float, y: float) -> None:
+        self._location.x = x
+        self._location.y = y
+
+
+class Obstacle:
+    """Неподвижный прямоугольник, сквозь который персонажи не проходят."""
+    __slots__ = ('left', 'top', 'width', 'height')
+
+    def __init__(self, left: float, top: float, width: float, height: float):
+        self.left = left
+        self.top = top
+        self.width = width
+        self.height = height
+
+
+class CharacterPool:
+    """Переиспользует объекты убранных из игры персонажей
+    вместо того чтобы создавать новых.
+    """
+    def __init__(self):
+        self._free: list[Character] = []
+
+    def __len__(self) -> int:
+        """Количество персонажей, готовых к повторному использованию."""
+        return len(self._free)
+
+    def acquire(self, x: float = 0, y: float = 0) -> Character:
+        if not self._free:
+            return Character(Point(x, y))
+        character = self._free.pop()
+        character.move_to_coordinates(x, y)
+        return character
+
+    def release(self, character: Character) -> None:
+        self._free.append(character)
+
+
+class Population:
+    """Множество персонажей, координаты и скорости которых
+    хранятся в непрерывных массивах NumPy, чтобы их можно было двигать
+    одним векторизованным шагом.
+    """
+    def __init__(self, capacity: int = 1024):
+        self._count = 0
+        self._positions = np.zeros((capacity, 2), dtype=np.float64)
+        self._velocities = np.zeros((capacity, 2), dtype=np.float64)
+        # 1 для персонажей, которые слушаются контроллер, иначе 0.
+        self._control_weights = np.zeros(capacity, dtype=np.float64)
+        self._scratch = np.zeros((capacity, 2), dtype=np.float64)
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def positions(self) -> np.ndarray:
+        return self._positions[:self._count]
+
+    @property
+    def velocities(self) -> np.ndarray:
+        return self._velocities[:self._count]
+
+    @property
+    def control_weights(self) -> np.ndarray:
+        return self._control_weights[:self._count]
+
+    @property
+    def scratch(self) -> np.ndarray:
+        """Буфер для промежуточных вычислений, чтобы не выделять память каждый тик."""
+        return self._scratch[:self._count]
+
+    def add(
+            self,
+            location: Point,
+            velocity: Point | None = None,
+            controlled: bool = True) -> int:
+        """Добавляет персонажа и возвращает его индекс в популяции."""
+        if self._count == len(self._positions):
+            self._grow()
+        index = self._count
+        self._positions[index] = (location.x, location.y)
+        if velocity is not None:
+            self._velocities[index] = (velocity.x, velocity.y)
+        self._control_weights[index] = 1 if controlled else 0
+        self._count += 1
+        return index
+
+    def get_location(self, index: int) -> Point:
+        x, y = self.positions[index]
+        return Point(float(x), float(y))
+
+    def _grow(self) -> None:
+        capacity = max(1, len(self._positions) * 2)
+        for name in ('_positions', '_velocities', '_control_weights', '_scratch'):
+            old = getattr(self, name)
+            new = np.zeros((capacity, *old.shape[1:]), dtype=old.dtype)
+            new[:len(old)] = old
+            setattr(self, name, new)
@@ -0,0 +1,196 @@
+import json
+import time
+from array import array
+from typing import Sequence
+
+import pygame
+
+from sandbox.view.text import render_text
+
+
+PHASES = ('events', 'survey', 'handle', 'update', 'draw', 'present')
+
+
+class FrameProfiler:
+    """Замеряет длительность фаз каждого кадра и хранит последние кадры
+    в кольцевом буфере фиксированного размера.
+
+    В игровом цикле вызываются begin_frame, затем mark после каждой фазы
+    и end_frame.
+    """
+    def __init__(
+            self,
+            capacity: int = 600,
+            frame_budget: float = 1 / 60,
+            phases: Sequence[str] = PHASES):
+        """
+        Args:
+            capacity: Сколько последних кадров хранить.
+            frame_budget: Время в секундах, больше которого кадр считается пропущенным.
+            phases: Названия фаз в порядке их выполнения.
+        """
+        self._capacity = capacity
+        self.frame_budget = frame_budget
+        self._phases = tuple(phases)
+        self._phase_indexes = {phase: i for i, phase in enumerate(self._phases)}
+        self._durations = [array('d', bytes(8 * capacity)) for _ in self._phases]
+        self._totals = array('d', bytes(8 * capacity))
+        self._index = 0
+        self._count = 0
+        self._frame_number = 0
+        self._dropped_frames = 0
+
+        self._current = [0.0] * len(self._phases)
+        self._frame_start = 0.0
+        self._mark_time = 0.0
+
+    @property
+    def phases(self) -> tuple[str, ...]:
+        return self._phases
+
+    @property
+    def frame_count(self) -> int:
+        """Количество кадров, записанных за всё время."""
+        return self._frame_number
+
+    @property
+    def dropped_frames(self) -> int:
+        return self._dropped_frames
+
+    def begin_frame(self) -> None:
+        now = time.perf_counter()
+        self._current = [0.0] * len(self._phases)
+        self._frame_start = now
+        self._mark_time = now
+
+    def mark(self, phase: str) -> None:
+        """Завершает фазу: всё время с прошлой отметки относится к ней."""
+        now = time.perf_counter()
+        self._current[self._phase_indexes[phase]] += now - self._mark_time
+        self._mark_time = now
+
+    def end_frame(self) -> None:
+        now = time.perf_counter()
+        total = now - self._frame_start
+        index = self._index
+        for durations, duration in zip(self._durations, self._current):
+            durations[index] = duration
+        self._totals[index] = total
+        self._index = (index + 1) % self._capacity
+        self._count = min(self._count + 1, self._capacity)
+        self._frame_number += 1
+        if total > self.frame_budget:
+            self._dropped_frames += 1
+
+    def percentiles(
+            self,
+            phase: str | None = None,
+            percents: Sequence[int] = (50, 95, 99)) -> dict[str, float]:
+        """Возвращает перцентили длительности фазы в секундах
+        по кадрам в буфере. Без фазы считаются по полной длительности кадра.
+        """
+        if phase is None:
+            values = self._totals
+        else:
+            values = self._durations[self._phase_indexes[phase]]
+        ordered = sorted(values[:self._count])
+        if not ordered:
+            return {f'p{percent}': 0.0 for percent in percents}
+        return {
+            f'p{percent}': ordered[min(len(ordered) - 1, len(ordered) * percent // 100)]
+            for percent in percents
+        }
+
+    def summary(self) -> dict:
+        return {
+            'frames': self._frame_number,
+            'dropped_frames': self._dropped_frames,
+            'total': self.percentiles(),
+            'phases': {phase: self.percentiles(phase) for phase in self._phases},
+        }
+
+    def export_jsonl(self, path: str) -> None:
+        """Записывает кадры из буфера, от старых к новым, по одному JSON на строку.
+        Длительности в миллисекундах.
+        """
+        first_number = self._frame_number - self._count
+        start = (self._index - self._count) % self._capacity
+        with open(path, 'w') as file:
+            for offset in range(self._count):
+                i = (start + offset) % self._capacity
+                record = {
+                    'frame': first_number + offset,
+                    'total_ms': self._totals[i] * 1000,
+                    'phases_ms': {
+                        phase: durations[i] * 1000
+                        for phase, durations
+                        in zip(self._phases, self._durations)
+                    },
+                }
+                file.write(json.dumps(record) + '\n')
+
+
+class ProfilerOverlay:
+    """Выводит поверх кадра перцентили фаз и количество пропущенных кадров.
+    Статистика пересчитывается раз в refresh_frames кадров,
+    чтобы сортировка буфера не выполнялась каждый кадр.
+    """
+    def __init__(
+            self,
+            profiler: FrameProfiler,
+            font: pygame.font.Font,
+            location: tuple[int, int] = (5, 5),
+            refresh_frames: int = 30):
+        self._profiler = profiler
+        self._font = font
+        self._location = location
+        self._refresh_frames = refresh_frames
+        self._lines: list[str] = []
+        self._refreshed_at = -refresh_frames
+        self.is_visible = False
+
+    def toggle(self) -> None:
+        self.is_visible = not self.is_visible
+
+    def draw(self, screen: pygame.Surface) -> pygame.Rect:
+        """Рисует оверлей и возвращает занятую им область."""
+        if self._profiler.frame_count - self._refreshed_at >= self._refresh_frames:
+            self._refresh()
+
+        surfaces = [
+            render_text(self._font, line, False, (255, 255, 255))
+            for line
+            in self._lines
+        ]
+        width = max(surface.get_width() for surface in surfaces) + 10
+        height = sum(surface.get_height() for surface in surfaces) + 10
+        rect = pygame.Rect(self._location, (width, height))
+        screen.fill((0, 0, 0), rect)
+
+        x, y = self._location[0] + 5, self._location[1] + 5
+        for surface in surfaces:
+            screen.blit(surface, (x, y))
+            y += surface.get_height()
+        return rect
+
+    def _refresh(self) -> None:
+        self._refreshed_at = self._profiler.frame_count
+        summary = self._profiler.summary()
+        self._lines = [
+            f"frames {summary['frames']} dropped {summary['dropped_frames']}",
+            self._format_line('total', summary['total']),
+        ]
+        self._lines += [
+            self._format_line(phase, percentiles)
+            for phase, percentiles
+            in summary['phases'].items()
+        ]
+
+    @staticmethod
+    def _format_line(name: str, percentiles: dict[str, float]) -> str:
+        values = ' '.join(
+            f"{key} {value * 1000:5.1f}"
+            for key, value
+            in percentiles.items()
+        )
+        return f"{name:<8}{values} ms"
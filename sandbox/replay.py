@@ -0,0 +1,209 @@
+import struct
+from typing import BinaryIO, Callable, Sequence
+
+import pygame
+
+from .controllers import ActionMap, Controller
+
+
+# Формат журнала:
+#   заголовок: MAGIC, версия (1 байт), количество действий (1 байт);
+#   кадр: varint с маской изменившихся с прошлого кадра действий,
+#   затем для каждого изменившегося действия по порядку битов один байт состояния
+#   и, только для STATE_VALUE, значение float32.
+# Кадр без изменений занимает один байт.
+MAGIC = b'SBIL'
+VERSION = 1
+
+STATE_DEACTIVATED = 0
+STATE_ACTIVATED = 1
+STATE_VALUE = 2
+
+_FLOAT = struct.Struct('<f')
+
+
+def _encode_state(activated: bool, value: float) -> tuple[int, float]:
+    if not activated:
+        return STATE_DEACTIVATED, 0
+    if value == 1:
+        return STATE_ACTIVATED, 1
+    # Значения в ActionMap уже хранятся во float32,
+    # поэтому запись и воспроизведение дают одинаковый результат.
+    return STATE_VALUE, value
+
+
+class InputRecorder:
+    """Дописывает в бинарный поток состояние действий за каждый кадр."""
+    def __init__(self, stream: BinaryIO, action_count: int):
+        if action_count > 255:
+            raise ValueError("too many actions to record")
+        self._stream = stream
+        self._previous: list[tuple[int, float]] = [(STATE_DEACTIVATED, 0)] * action_count
+        self._stream.write(MAGIC + bytes((VERSION, action_count)))
+
+    def write_frame(self, actions: ActionMap) -> None:
+        mask = 0
+        payload = bytearray()
+        for i, (flag, value) in enumerate(zip(actions.flags, actions.values)):
+            state = _encode_state(bool(flag), value)
+            if state == self._previous[i]:
+                continue
+            self._previous[i] = state
+            mask |= 1 << i
+            payload.append(state[0])
+            if state[0] == STATE_VALUE:
+                payload += _FLOAT.pack(state[1])
+
+        frame = bytearray()
+        while True:
+            byte = mask & 0x7F
+            mask >>= 7
+            if mask:
+                frame.append(byte | 0x80)
+            else:
+                frame.append(byte)
+                break
+        self._stream.write(frame + payload)
+
+
+class InputLogReader:
+    """Читает кадры, записанные InputRecorder."""
+    def __init__(self, stream: BinaryIO):
+        self._stream = stream
+        header = stream.read(len(MAGIC) + 2)
+        if len(header) != len(MAGIC) + 2 or header[:len(MAGIC)] != MAGIC:
+            raise ValueError("stream is not an input log")
+        if header[len(MAGIC)] != VERSION:
+            raise ValueError(f"unsupported input log version {header[len(MAGIC)]}")
+        self._action_count = header[len(MAGIC) + 1]
+        self._state: list[tuple[bool, float]] = [(False, 0)] * self._action_count
+
+    @property
+    def action_count(self) -> int:
+        return self._action_count
+
+    def read_frame(self) -> list[tuple[bool, float]] | None:
+        """Возвращает состояние (activated, value) каждого действия в следующем кадре
+        или None, если журнал закончился.
+        """
+        mask = 0
+        shift = 0
+        while True:
+            byte = self._stream.read(1)
+            if not byte:
+                if shift:
+                    raise ValueError("input log is truncated")
+                return None
+            mask |= (byte[0] & 0x7F) << shift
+            shift += 7
+            if not byte[0] & 0x80:
+                break
+        if mask >> self._action_count:
+            raise ValueError("input log is corrupt")
+
+        i = 0
+        while mask:
+            if mask & 1:
+                kind = self._read_exactly(1)[0]
+                if kind == STATE_DEACTIVATED:
+                    self._state[i] = (False, 0)
+                elif kind == STATE_ACTIVATED:
+                    self._state[i] = (True, 1)
+                elif kind == STATE_VALUE:
+                    self._state[i] = (True, _FLOAT.unpack(self._read_exactly(4))[0])
+                else:
+                    raise ValueError("input log is corrupt")
+            mask >>= 1
+            i += 1
+        return self._state
+
+    def _read_exactly(self, size: int) -> bytes:
+        data = self._stream.read(size)
+        if len(data) != size:
+            raise ValueError("input log is truncated")
+        return data
+
+
+class RecordingController(Controller):
+    """Обёртка над любым контроллером, которая записывает в журнал
+    результат каждого опроса контролов.
+    """
+    def __init__(self, controller: Controller, stream: BinaryIO):
+        self._controller = controller
+        self._actions = controller.actions
+        self._move_up = controller.move_up
+        self._move_right = controller.move_right
+        self._move_down = controller.move_down
+        self._move_left = controller.move_left
+        self._accept = controller.accept
+        self._quit = controller.quit
+        self._recorder = InputRecorder(stream, len(self._actions))
+
+    def conduct_survey_of_controls(self, events) -> None:
+        self._controller.conduct_survey_of_controls(events)
+        self._recorder.write_frame(self._actions)
+
+    def deactivate_all_controls(self):
+        self._controller.deactivate_all_controls()
+
+    def time_until_next_survey(self) -> float | None:
+        return self._controller.time_until_next_survey()
+
+    def __str__(self):
+        return f"Recording {self._controller}"
+
+
+class ReplayController(Controller):
+    """Воспроизводит журнал ввода кадр за кадром.
+    События pygame игнорируются, поэтому воспроизведение не требует окна
+    и может идти быстрее реального времени.
+    """
+    def __init__(self, stream: BinaryIO, extra_actions: Sequence[str] = ()):
+        """
+        Args:
+            extra_actions: Дополнительные действия контроллера, с которого шла запись.
+        """
+        super().__init__(extra_actions)
+        self._reader = InputLogReader(stream)
+        if self._reader.action_count != len(self._actions):
+            raise ValueError("input log was recorded with a different set of actions")
+        self._finished = False
+
+    @property
+    def finished(self) -> bool:
+        return self._finished
+
+    def conduct_survey_of_controls(self, events) -> None:
+        if self._finished:
+            return
+        state = self._reader.read_frame()
+        if state is None:
+            self._finished = True
+            return
+        actions = self._actions
+        for action_id, (activated, value) in enumerate(state):
+            if activated:
+                actions.activate(action_id, value)
+
+    def run(self, frame_handler: Callable[[], None]) -> int:
+        """Прогоняет оставшийся журнал без ожидания между кадрами.
+
+        Args:
+            frame_handler: Вызывается на каждом кадре после опроса контроллера,
+            например, чтобы сдвинуть персонажа через Mover с этим контроллером.
+
+        Returns:
+            Количество воспроизведённых кадров.
+        """
+        events: list[pygame.event.Event] = []
+        frames = 0
+        while True:
+            self.conduct_survey_of_controls(events)
+            if self._finished:
+                return frames
+            frame_handler()
+            self.deactivate_all_controls()
+            frames += 1
+
+    def __str__(self):
+        return "Replay"
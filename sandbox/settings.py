@@ -1,11 +1,120 @@
 from abc import ABC
+import atexit
 import os
 import json
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from typing import Callable
 
 
 SETTINGS_FILE_PATH = os.path.join(os.path.dirname(__file__), 'settings.json')
 
 
+class SettingsStore:
+    """Записывает настройки на диск в фоновом потоке.
+
+    Изменения, сделанные одно за другим в течение delay секунд,
+    объединяются в одну запись. Файл заменяется атомарно через временный файл,
+    поэтому падение во время записи не портит настройки.
+    Несохранённые изменения записываются при выходе из программы.
+    Ошибки фоновой записи передаются в error_handlers, а без них
+    выводятся в stderr, поток записи при этом продолжает работать.
+    """
+    def __init__(self, path: str = SETTINGS_FILE_PATH, delay: float = 0.5):
+        self._path = path
+        self._delay = delay
+        self._condition = threading.Condition()
+        self._write_lock = threading.Lock()
+        # (номер версии, данные) последних незаписанных настроек.
+        self._pending: tuple[int, str] | None = None
+        self._deadline = 0.0
+        self._version = 0
+        self._written_version = 0
+        self._thread: threading.Thread | None = None
+        self.error_handlers: list[Callable[[OSError], None]] = []
+        atexit.register(self.flush)
+
+    def save(self, data: str) -> None:
+        """Планирует запись и сразу возвращает управление."""
+        with self._condition:
+            self._version += 1
+            self._pending = (self._version, data)
+            self._deadline = time.monotonic() + self._delay
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name='settings-store', daemon=True
+                )
+                self._thread.start()
+            self._condition.notify()
+
+    def flush(self) -> None:
+        """Немедленно записывает отложенные изменения в текущем потоке
+        и дожидается записи, которую фоновый поток уже начал.
+        """
+        with self._condition:
+            pending = self._pending
+            self._pending = None
+        with self._write_lock:
+            if pending is not None:
+                self._write(*pending)
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while self._pending is None:
+                    self._condition.wait()
+                # Ждём, пока изменения не перестанут поступать.
+                remaining = self._deadline - time.monotonic()
+                while self._pending is not None and remaining > 0:
+                    self._condition.wait(remaining)
+                    remaining = self._deadline - time.monotonic()
+                pending = self._pending
+                self._pending = None
+                if pending is None:
+                    continue
+                # Запись начинается, пока данные ещё под условием,
+                # чтобы flush не разминулся с ней.
+                self._write_lock.acquire()
+            try:
+                self._write(*pending)
+            except OSError as error:
+                self._report(error)
+            finally:
+                self._write_lock.release()
+
+    def _report(self, error: OSError) -> None:
+        if not self.error_handlers:
+            print(f"Failed to save settings: {error}", file=sys.stderr)
+        for handler in self.error_handlers:
+            handler(error)
+
+    def _write(self, version: int, data: str) -> None:
+        """Вызывается под _write_lock."""
+        # flush из другого потока мог уже записать более новую версию.
+        if version <= self._written_version:
+            return
+        directory = os.path.dirname(self._path)
+        descriptor, temp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(descriptor, 'w') as file:
+                file.write(data)
+                file.flush()
+                os.fsync(file.fileno())
+            if os.path.exists(self._path):
+                shutil.copymode(self._path, temp_path)
+            os.replace(temp_path, self._path)
+        except BaseException:
+            os.remove(temp_path)
+            raise
+        self._written_version = version
+
+
+settings_store = SettingsStore()
+
+
 class Setting:
     def __init__(self, value: int):
         self.value = value
@@ -22,8 +131,7 @@ class ControllerSettings(ABC):
         self.down = down
 
     def save(self):
-        with open(SETTINGS_FILE_PATH, 'w') as file:
-            file.write(json.dumps(self.__dict__, default=lambda o: o.__dict__))
+        settings_store.save(json.dumps(self.__dict__, default=lambda o: o.__dict__))
 
 
 class PygameKeyboardSettings(ControllerSettings):
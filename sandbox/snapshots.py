@@ -0,0 +1,84 @@
+from array import array
+
+
+class InputSnapshot:
+    """Неизменяемое состояние действий контроллера за один кадр.
+
+    Активные действия хранятся битовой маской, где бит с номером действия
+    установлен, если оно активно, а величины — упакованными float32.
+    Нажатия и отпускания получаются XOR с маской прошлого кадра,
+    поэтому любой запрос к снимку стоит несколько битовых операций.
+    """
+    __slots__ = ('_frame', '_mask', '_previous_mask', '_values')
+
+    def __init__(self, frame: int, mask: int, previous_mask: int, values: bytes):
+        """
+        Args:
+            frame: Номер кадра InputHub.
+            mask: Маска активных в этом кадре действий.
+            previous_mask: Маска активных в прошлом кадре действий.
+            values: Величины действий, упакованные как array('f').
+        """
+        self._frame = frame
+        self._mask = mask
+        self._previous_mask = previous_mask
+        self._values = memoryview(values).cast('f')
+
+    @classmethod
+    def capture(
+            cls,
+            flags: bytearray,
+            values: array,
+            frame: int,
+            previous: 'InputSnapshot | None' = None) -> 'InputSnapshot':
+        """Снимает состояние с массивов ActionMap.
+        Нажатия и отпускания считаются от previous, только если он снят
+        в предыдущем кадре. Иначе, например у окна, которое было перекрыто
+        другим, прошлым кадром считается кадр без активных действий.
+        """
+        mask = 0
+        # Активных действий обычно единицы, поэтому ищем только их.
+        action_id = flags.find(1)
+        while action_id != -1:
+            mask |= 1 << action_id
+            action_id = flags.find(1, action_id + 1)
+        if previous is not None and previous._frame == frame - 1:
+            previous_mask = previous._mask
+        else:
+            previous_mask = 0
+        return cls(frame, mask, previous_mask, values.tobytes())
+
+    @property
+    def frame(self) -> int:
+        return self._frame
+
+    @property
+    def mask(self) -> int:
+        return self._mask
+
+    @property
+    def changed(self) -> int:
+        """Маска действий, состояние которых изменилось с прошлого кадра."""
+        return self._mask ^ self._previous_mask
+
+    @property
+    def pressed(self) -> int:
+        """Маска действий, которые стали активны в этом кадре."""
+        return (self._mask ^ self._previous_mask) & self._mask
+
+    @property
+    def released(self) -> int:
+        """Маска действий, которые перестали быть активны в этом кадре."""
+        return (self._mask ^ self._previous_mask) & self._previous_mask
+
+    def is_active(self, action_id: int) -> bool:
+        return self._mask >> action_id & 1 == 1
+
+    def was_pressed(self, action_id: int) -> bool:
+        return self.pressed >> action_id & 1 == 1
+
+    def was_released(self, action_id: int) -> bool:
+        return self.released >> action_id & 1 == 1
+
+    def value(self, action_id: int) -> float:
+        return self._values[action_id]
@@ -0,0 +1,234 @@
+import time
+from typing import Callable, Hashable, Iterable
+
+
+class FramePacer:
+    """Выдерживает заданную частоту кадров.
+
+    Большую часть ожидания поток спит, а последние миллисекунды перед дедлайном
+    досчитываются активным ожиданием, потому что точность time.sleep на разных
+    системах бывает хуже одной миллисекунды.
+    """
+    def __init__(
+            self,
+            fps: int = 60,
+            spin_threshold: float = 0.002,
+            clock: Callable[[], float] = time.perf_counter,
+            sleep: Callable[[float], None] = time.sleep):
+        """
+        Args:
+            fps: Целевая частота кадров.
+            spin_threshold: Сколько секунд перед дедлайном ждать активно.
+            clock: Монотонные часы в секундах.
+            sleep: Функция сна, которую можно подменить в тестах.
+        """
+        self._clock = clock
+        self._sleep = sleep
+        self._spin_threshold = spin_threshold
+        self._frame_duration = 0.0
+        self._deadline = 0.0
+        self.fps = fps
+
+    @property
+    def fps(self) -> int:
+        return self._fps
+
+    @fps.setter
+    def fps(self, value: int) -> None:
+        if value <= 0:
+            raise ValueError("fps must be positive")
+        self._fps = value
+        self._frame_duration = 1 / value
+
+    def reset(self) -> None:
+        self._deadline = self._clock() + self._frame_duration
+
+    def wait(self) -> None:
+        """Блокирует поток до начала следующего кадра."""
+        now = self._clock()
+        remaining = self._deadline - now
+
+        if remaining > self._spin_threshold:
+            self._sleep(remaining - self._spin_threshold)
+        while self._clock() < self._deadline:
+            pass
+
+        self._deadline += self._frame_duration
+        # Если кадр сильно опоздал, то не пытаемся догонять пропущенные дедлайны,
+        # иначе следующие кадры пойдут без пауз.
+        now = self._clock()
+        if now > self._deadline:
+            self._deadline = now + self._frame_duration
+
+
+class FixedTimestep:
+    """Накапливает прошедшее реальное время и отдаёт его шагами фиксированной
+    длины, чтобы симуляция не зависела от частоты отрисовки.
+    """
+    def __init__(
+            self,
+            rate: int = 60,
+            max_steps: int = 5,
+            clock: Callable[[], float] = time.perf_counter):
+        """
+        Args:
+            rate: Количество шагов симуляции в секунду.
+            max_steps: Ограничение шагов за один кадр,
+            чтобы после долгой паузы игра не пыталась догнать всё время разом.
+            clock: Монотонные часы в секундах.
+        """
+        self._step = 1 / rate
+        self._max_steps = max_steps
+        self._clock = clock
+        self._accumulator = 0.0
+        self._previous_time = 0.0
+
+    @property
+    def step(self) -> float:
+        return self._step
+
+    @property
+    def interpolation(self) -> float:
+        """Доля шага, которая осталась в накопителе после последнего advance.
+        Пригодится для интерполяции при отрисовке.
+        """
+        return self._accumulator / self._step
+
+    def reset(self) -> None:
+        self._accumulator = 0.0
+        self._previous_time = self._clock()
+
+    def advance(self) -> int:
+        """Возвращает количество шагов симуляции, которые нужно выполнить в этом кадре."""
+        now = self._clock()
+        self._accumulator += now - self._previous_time
+        self._previous_time = now
+
+        steps = int(self._accumulator / self._step)
+        if steps > self._max_steps:
+            steps = self._max_steps
+            self._accumulator = 0.0
+        else:
+            self._accumulator -= steps * self._step
+        return steps
+
+
+class FrameScheduler:
+    """Планировщик кадров: фиксированный шаг симуляции
+    и отдельная от него частота отрисовки.
+    """
+    def __init__(self, fps: int = 60, simulation_rate: int = 60):
+        self._pacer = FramePacer(fps)
+        self._timestep = FixedTimestep(simulation_rate)
+
+    @property
+    def fps(self) -> int:
+        return self._pacer.fps
+
+    @fps.setter
+    def fps(self, value: int) -> None:
+        self._pacer.fps = value
+
+    @property
+    def interpolation(self) -> float:
+        return self._timestep.interpolation
+
+    def start(self) -> None:
+        """Должен вызываться перед входом в игровой цикл."""
+        self._pacer.reset()
+        self._timestep.reset()
+
+    def simulation_steps(self) -> int:
+        return self._timestep.advance()
+
+    def wait_for_next_frame(self) -> None:
+        self._pacer.wait()
+
+
+class AutoRepeat:
+    """Решает, когда удерживаемый элемент управления должен сработать снова.
+
+    Срабатывание происходит при нажатии, затем через delay_ms и дальше
+    каждые interval_ms, пока элемент удерживается. Состояние хранится отдельно
+    для каждого элемента, а время берётся из монотонных часов,
+    поэтому повтор не зависит ни от частоты кадров, ни от других элементов.
+    """
+    def __init__(
+            self,
+            delay_ms: int = 500,
+            interval_ms: int = 500,
+            clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            delay_ms: Задержка перед первым повтором.
+            interval_ms: Промежуток между последующими повторами.
+            clock: Монотонные часы в секундах.
+        """
+        if delay_ms < 0 or interval_ms <= 0:
+            raise ValueError("repeat delay must be non-negative and interval positive")
+        self._delay = delay_ms / 1000
+        self._interval = interval_ms / 1000
+        self._clock = clock
+        # элемент -> время следующего срабатывания
+        self._next_times: dict[Hashable, float] = {}
+
+    def now(self) -> float:
+        return self._clock()
+
+    @property
+    def tracked_keys(self) -> Iterable[Hashable]:
+        """Элементы, которые удерживаются и ждут повтора.
+        Отпущенный элемент пропадает отсюда при вызове update с held=False.
+        """
+        return self._next_times.keys()
+
+    def press(self, key: Hashable, now: float) -> bool:
+        """Начинает отсчёт повторов заново, элемент срабатывает сразу."""
+        self._next_times[key] = now + self._delay
+        return True
+
+    def update(
+            self,
+            key: Hashable,
+            held: bool,
+            now: float,
+            start_on_hold: bool = True) -> bool:
+        """Возвращает True, если элемент key должен сработать в этом кадре.
+
+        Args:
+            key: Любой идентификатор элемента управления.
+            held: Удерживается ли элемент в этом кадре.
+            now: Время кадра, полученное из now(), общее для всех элементов.
+            start_on_hold: Считать ли нажатием начало удержания.
+            Если нажатия приходят отдельно через press, то удержание без нажатия
+            (например, клавиша зажата ещё до открытия окна) не срабатывает.
+        """
+        if not held:
+            self._next_times.pop(key, None)
+            return False
+
+        next_time = self._next_times.get(key)
+        if next_time is None:
+            if start_on_hold:
+                return self.press(key, now)
+            return False
+        if now < next_time:
+            return False
+
+        next_time += self._interval
+        # После долгого кадра не выдаём пачку пропущенных повторов.
+        if next_time <= now:
+            next_time = now + self._interval
+        self._next_times[key] = next_time
+        return True
+
+    def time_until_next(self, now: float) -> float | None:
+        """Через сколько секунд сработает ближайший повтор
+        или None, если ничего не удерживается.
+        """
+        if not self._next_times:
+            return None
+        return max(0.0, min(self._next_times.values()) - now)
+
+    def reset(self) -> None:
+        self._next_times.clear()
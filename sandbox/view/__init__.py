@@ -1,3 +1,8 @@
+from . import camera  # noqa
 from . import controls  # noqa
+from . import display  # noqa
 from . import windows  # noqa
+from . import scenes  # noqa
 from . import sprites  # noqa
+from . import text  # noqa
+from . import fonts  # noqa
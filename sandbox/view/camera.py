@@ -0,0 +1,74 @@
+import pygame
+
+from sandbox.model import Character
+
+
+class Camera:
+    """Видимая на экране часть мира.
+
+    Хранит положение левого верхнего угла вида в мировых координатах
+    и переводит мировые координаты в экранные.
+    """
+    def __init__(
+            self,
+            view_size: tuple[int, int],
+            world_size: tuple[float, float] | None = None):
+        """
+        Args:
+            view_size: Размер вида, обычно размер экрана.
+            world_size: Если задан, камера не показывает ничего за краями мира.
+        """
+        self._view_rect = pygame.Rect((0, 0), view_size)
+        self._world_size = world_size
+        self._target: Character | None = None
+        self._target_size = (0.0, 0.0)
+
+    @property
+    def view_rect(self) -> pygame.Rect:
+        """Видимая область в мировых координатах."""
+        return self._view_rect
+
+    @property
+    def offset(self) -> tuple[int, int]:
+        return self._view_rect.topleft
+
+    def follow(
+            self,
+            character: Character | None,
+            width: float = 0,
+            height: float = 0) -> None:
+        """Держит персонажа в центре вида, None отключает слежение.
+
+        Args:
+            width: Ширина персонажа, чтобы в центре был его центр, а не угол.
+            height: Высота персонажа.
+        """
+        self._target = character
+        self._target_size = (width, height)
+
+    def move_to(self, left: float, top: float) -> None:
+        """Ставит левый верхний угол вида в точку мира."""
+        rect = self._view_rect
+        if self._world_size is not None:
+            world_width, world_height = self._world_size
+            left = max(0, min(left, world_width - rect.width))
+            top = max(0, min(top, world_height - rect.height))
+        # Целые координаты, чтобы неподвижные спрайты не дрожали при движении.
+        rect.topleft = (round(left), round(top))
+
+    def update(self) -> None:
+        if self._target is None:
+            return
+        location = self._target.location
+        width, height = self._target_size
+        rect = self._view_rect
+        self.move_to(
+            location.x + width / 2 - rect.width / 2,
+            location.y + height / 2 - rect.height / 2
+        )
+
+    def world_to_screen(self, x: float, y: float) -> tuple[float, float]:
+        return x - self._view_rect.x, y - self._view_rect.y
+
+    def screen_to_world(self, x: float, y: float) -> tuple[float, float]:
+        return x + self._view_rect.x, y + self._view_rect.y
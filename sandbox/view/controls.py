@@ -6,12 +6,57 @@ import pygame
 # Эти зависимости мешают тестировать модуль
 from sandbox import controllers
 from sandbox.settings import Setting
+from sandbox.view.text import render_text
 
 
 class Control(ABC):
     def __init__(self, location: tuple[int, int] = (0, 0)):
-        self.location = location
-        self.is_active = False  # переименовать в is_focused
+        self._location = location
+        self._is_active = False  # переименовать в is_focused
+        self._dirty_rect: pygame.Rect | None = None
+
+    @property
+    def location(self) -> tuple[int, int]:
+        return self._location
+
+    @location.setter
+    def location(self, value: tuple[int, int]) -> None:
+        self.invalidate()
+        self._location = value
+        self.invalidate()
+
+    @property
+    def is_active(self) -> bool:
+        return self._is_active
+
+    @is_active.setter
+    def is_active(self, value: bool) -> None:
+        if self._is_active == value:
+            return
+        self._is_active = value
+        self.invalidate()
+
+    @property
+    def rect(self) -> pygame.Rect:
+        """Область экрана, которую занимает контрол."""
+        return pygame.Rect(self._location, (0, 0))
+
+    def invalidate(self) -> None:
+        """Помечает текущую область контрола как требующую перерисовки.
+        Должен вызываться до и после любого изменения внешнего вида контрола,
+        чтобы перерисовались и старая, и новая области.
+        """
+        rect = self.rect
+        if self._dirty_rect is None:
+            self._dirty_rect = rect
+        else:
+            self._dirty_rect.union_ip(rect)
+
+    def pop_dirty_rect(self) -> pygame.Rect | None:
+        """Возвращает область, накопленную с прошлой отрисовки, и сбрасывает её."""
+        rect = self._dirty_rect
+        self._dirty_rect = None
+        return rect
 
     @abstractmethod
     def draw(self, screen):
@@ -34,8 +79,16 @@ class Label(Control):
         self.location = location
         self.update_surface_from_text(text)
 
+    @property
+    def rect(self) -> pygame.Rect:
+        if self._surface is None:
+            return super().rect
+        return self._surface.get_rect(topleft=self.location)
+
     def update_surface_from_text(self, text) -> None:
-        self._surface = self._font.render(text, self._antialias, self._color)
+        self.invalidate()
+        self._surface = render_text(self._font, text, self._antialias, self._color)
+        self.invalidate()
 
     def draw(self, screen):
         screen.blit(self._surface, self.location)
@@ -62,9 +115,7 @@ class Key(Label):
         self._control = control
 
     def change_text(self, value):
-        self._surface: pygame.surface.Surface = self._font.render(
-            value, self._antialias, self._color
-        )
+        self.update_surface_from_text(value)
 
     def activate(self):
         self.is_active = True
@@ -73,16 +124,18 @@ class Key(Label):
         self.is_active = False
 
     def draw_frame(self, screen):
-        rect = self._surface.get_rect()
-        rect.topleft = self.location
-
         pygame.draw.rect(
             surface=screen,
             color=(0, 0, 0),
-            rect=rect,
+            rect=self.rect,
             width=2
         )
 
+    def draw(self, screen):
+        super().draw(screen)
+        if self.is_active:
+            self.draw_frame(screen)
+
 
 class Button(Label):
     def __init__(self, font, text, antialias, color, location):
@@ -103,13 +156,10 @@ class Button(Label):
         self.is_active = False
 
     def draw_frame(self, screen):
-        rect = self._surface.get_rect()  # type: ignore
-        rect.topleft = self.location
-
         pygame.draw.rect(
             surface=screen,
             color=(0, 0, 0),
-            rect=rect,
+            rect=self.rect,
             width=2
         )
 
@@ -124,12 +174,14 @@ class ActiveFlag(Control):
         super().__init__(location)
         self._surface = pygame.Surface(size)
         self._surface.fill(color)
-        self._rect = self._surface.get_rect()
-        self._rect.center = location
+
+    @property
+    def rect(self) -> pygame.Rect:
+        return self._surface.get_rect(center=self.location)
 
     def draw(self, screen):
         if self.is_active:
-            screen.blit(self._surface, self._rect)
+            screen.blit(self._surface, self.rect)
 
 
 class RowSetting(Control):
@@ -150,6 +202,24 @@ class RowSetting(Control):
     def deactivate(self):
         self._activation_toggle(False)
 
+    @property
+    def rect(self) -> pygame.Rect:
+        return self._controls[0].rect.unionall(
+            [component.rect for component in self._controls[1:]]
+        )
+
+    def pop_dirty_rect(self) -> pygame.Rect | None:
+        dirty_rects = [
+            rect
+            for rect
+            in [super().pop_dirty_rect()]
+            + [component.pop_dirty_rect() for component in self._controls]
+            if rect is not None
+        ]
+        if not dirty_rects:
+            return None
+        return dirty_rects[0].unionall(dirty_rects[1:])
+
     def draw(self, screen):
         for component in self._controls:
             component.draw(screen)
@@ -0,0 +1,54 @@
+import time
+from typing import Callable, Sequence
+
+import pygame
+
+
+class DisplayManager:
+    """Владеет единственной поверхностью экрана, общей для всех окон.
+
+    Поверхность создаётся при первом обращении, поэтому пока ни одно окно
+    не показано, pygame.display.set_mode не вызывается.
+    """
+    def __init__(self, size: tuple[int, int], start_time: float | None = None):
+        """
+        Args:
+            size: Размер экрана.
+            start_time: Момент запуска приложения по time.perf_counter,
+            от которого считается время до первого кадра.
+        """
+        self._size = size
+        self._surface: pygame.Surface | None = None
+        self._start_time = time.perf_counter() if start_time is None else start_time
+        self._time_to_first_frame: float | None = None
+        self.first_frame_handlers: list[Callable[[float], None]] = []
+
+    @property
+    def size(self) -> tuple[int, int]:
+        return self._size
+
+    @property
+    def surface(self) -> pygame.Surface:
+        if self._surface is None:
+            self._surface = pygame.display.set_mode(self._size)
+        return self._surface
+
+    @property
+    def time_to_first_frame(self) -> float | None:
+        """Секунды от запуска до первого вывода кадра на экран."""
+        return self._time_to_first_frame
+
+    def set_caption(self, caption: str) -> None:
+        pygame.display.set_caption(caption)
+
+    def update(self, rects: Sequence[pygame.Rect] | None = None) -> None:
+        """Выводит кадр на экран целиком или только указанные области."""
+        if rects is None:
+            pygame.display.update()
+        else:
+            pygame.display.update(rects)
+
+        if self._time_to_first_frame is None:
+            self._time_to_first_frame = time.perf_counter() - self._start_time
+            for handler in self.first_frame_handlers:
+                handler(self._time_to_first_frame)
@@ -0,0 +1,74 @@
+import json
+import os
+
+import pygame
+
+
+FONTS_CACHE_FILE_PATH = os.path.join(os.path.dirname(__file__), 'fonts_cache.json')
+
+
+class FontRegistry:
+    """Выдаёт общие объекты шрифтов по паре (название, размер).
+
+    pygame.font.SysFont при первом вызове сканирует все шрифты системы.
+    Реестр находит путь к файлу шрифта один раз и, если указан файл кэша,
+    запоминает его между запусками, так что при следующем старте сканирования нет.
+    Ненайденные шрифты в файл не попадают и ищутся заново при следующем запуске,
+    чтобы установленный позже шрифт подхватился.
+    """
+    def __init__(self, cache_file_path: str | None = None):
+        self._cache_file_path = cache_file_path
+        # None означает, что шрифт в системе не найден и используется шрифт pygame.
+        self._paths: dict[str, str | None] = self._load_paths()
+        self._fonts: dict[tuple[str, int], pygame.font.Font] = {}
+
+    def use_cache_file(self, cache_file_path: str) -> None:
+        """Включает хранение найденных путей в файле между запусками."""
+        self._cache_file_path = cache_file_path
+        self._paths = {**self._load_paths(), **self._paths}
+
+    def get(self, face: str, size: int) -> pygame.font.Font:
+        key = (face, size)
+        font = self._fonts.get(key)
+        if font is None:
+            font = pygame.font.Font(self._resolve_path(face), size)
+            self._fonts[key] = font
+        return font
+
+    def _resolve_path(self, face: str) -> str | None:
+        if face in self._paths:
+            path = self._paths[face]
+            if path is None or os.path.exists(path):
+                return path
+
+        path = pygame.font.match_font(face)
+        self._paths[face] = path
+        self._save_paths()
+        return path
+
+    def _load_paths(self) -> dict[str, str | None]:
+        if self._cache_file_path is None:
+            return {}
+        try:
+            with open(self._cache_file_path, 'r') as file:
+                paths = json.loads(file.read())
+        except (OSError, ValueError):
+            return {}
+        return {face: path for face, path in paths.items() if path is not None}
+
+    def _save_paths(self) -> None:
+        if self._cache_file_path is None:
+            return
+        try:
+            with open(self._cache_file_path, 'w') as file:
+                file.write(json.dumps(
+                    {face: path for face, path in self._paths.items() if path is not None}
+                ))
+        except OSError:
+            # Кэш только ускоряет запуск, без него всё продолжит работать.
+            pass
+
+
+# Файл кэша подключает приложение через use_cache_file,
+# чтобы бенчмарки и скрипты не писали в каталог пакета.
+fonts = FontRegistry()
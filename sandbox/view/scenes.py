@@ -0,0 +1,91 @@
+from typing import Callable
+
+from sandbox.input_hub import input_hub
+from sandbox.timing import FrameScheduler
+from sandbox.view.windows import Window
+
+
+class SceneStack:
+    """Стек открытых окон. Кадры получает только верхнее окно.
+
+    Переходы, запрошенные во время кадра, например из обработчика кнопки,
+    откладываются до его конца, чтобы кадр целиком относился к одному окну.
+    """
+    def __init__(self):
+        self._windows: list[Window] = []
+        self._transitions: list[Callable[[], None]] = []
+
+    def __len__(self) -> int:
+        return len(self._windows)
+
+    @property
+    def top(self) -> Window | None:
+        return self._windows[-1] if self._windows else None
+
+    def push(self, window: Window) -> None:
+        """Открывает окно поверх текущего."""
+        self._transitions.append(lambda: self._windows.append(window))
+
+    def pop(self) -> None:
+        """Закрывает верхнее окно и возвращает управление предыдущему."""
+        self._transitions.append(self._windows.pop)
+
+    def remove(self, window: Window) -> None:
+        """Закрывает окно, даже если поверх него уже открыто другое.
+        Если окно к этому моменту уже закрыто другим переходом, ничего не делает.
+        """
+        self._transitions.append(lambda: self._remove_now(window))
+
+    def _remove_now(self, window: Window) -> None:
+        if window in self._windows:
+            self._windows.remove(window)
+
+    def replace(self, window: Window) -> None:
+        """Заменяет верхнее окно, не возвращаясь к нему."""
+        self.pop()
+        self.push(window)
+
+    def apply_transitions(self) -> None:
+        """Выполняет отложенные переходы.
+        Окно, которое в итоге оказалось наверху, заново входит в показ.
+        """
+        if not self._transitions:
+            return
+        top = self.top
+        transitions, self._transitions = self._transitions, []
+        for transition in transitions:
+            transition()
+        if self.top is not None and (self.top is not top or not top.is_showing):
+            self.top.enter()
+
+
+class MainLoop:
+    """Единственный игровой цикл приложения.
+
+    Каждый кадр верхнее окно один раз получает события, опрашивает контроллер,
+    рисует и выводит кадр, а затем цикл один раз ждёт следующего кадра.
+    Дисплей и контроллеры при переходах между окнами не пересоздаются.
+    """
+    def __init__(self, scenes: SceneStack, scheduler: FrameScheduler):
+        """
+        Args:
+            scenes: Стек окон, цикл идёт, пока он не опустеет.
+            scheduler: Задаёт темп кадров для всех окон.
+            Тот же планировщик стоит отдать GameWindow для шагов симуляции.
+        """
+        self._scenes = scenes
+        self._scheduler = scheduler
+
+    def run(self) -> None:
+        scenes = self._scenes
+        scenes.apply_transitions()
+        self._scheduler.start()
+
+        while scenes.top is not None:
+            window = scenes.top
+            input_hub.wait(window.idle_timeout_ms())
+            window.process_frame()
+            if not window.is_showing:
+                scenes.remove(window)
+            scenes.apply_transitions()
+            self._scheduler.wait_for_next_frame()
@@ -1,20 +1,168 @@
+from typing import Iterable
+
 import pygame
 
+from sandbox.game_rules import SpatialHash
 # сомневаюсь что тут должна быть эта зависимость
 from sandbox.model import Character
+from sandbox.view.camera import Camera
+
+
+_solid_surfaces: dict[tuple[tuple[int, int], tuple[int, int, int]], pygame.Surface] = {}
+
+
+def get_solid_surface(
+        size: tuple[int, int],
+        color: tuple[int, int, int]) -> pygame.Surface:
+    """Возвращает одноцветную поверхность, общую для всех спрайтов
+    с таким же размером и цветом.
+    """
+    key = (size, color)
+    surface = _solid_surfaces.get(key)
+    if surface is None:
+        surface = pygame.Surface(size)
+        surface.fill(color)
+        _solid_surfaces[key] = surface
+    return surface
+
+
+def convert_to_display_format(surface: pygame.Surface) -> pygame.Surface:
+    """Приводит поверхность к формату пикселей экрана,
+    чтобы при отрисовке не пришлось конвертировать её на каждом blit.
+    """
+    if surface.get_flags() & pygame.SRCALPHA:
+        return surface.convert_alpha()
+    return surface.convert()
 
 
 class Sprite:
-    def __init__(self, model: Character):
-        self.surface = pygame.Surface((100, 100))
-        self.surface.fill((250, 50, 50))
-        self.rect = self.surface.get_rect()
-        self.rect.center = (300, 300)
+    def __init__(
+            self,
+            model: Character | None,
+            surface: pygame.Surface | None = None,
+            location: tuple[float, float] = (0, 0)):
+        """
+        Args:
+            model: Персонаж, за которым следует спрайт.
+            Без него спрайт неподвижен, например это стена или декорация.
+            location: Левый верхний угол неподвижного спрайта в мировых координатах.
+        """
+        self.surface = surface or get_solid_surface((100, 100), (250, 50, 50))
+        self.rect = self.surface.get_rect(topleft=location)
         self._character = model
+        if model is not None:
+            self.update()
+
+    @property
+    def is_static(self) -> bool:
+        return self._character is None
 
     def update(self):
+        if self._character is None:
+            return
         self.rect.x = self._character.location.x  # type: ignore
         self.rect.y = self._character.location.y  # type: ignore
 
     def draw(self, screen):
         screen.blit(self.surface, self.rect)
+
+
+class SpriteGroup:
+    """Рисует все видимые спрайты одним вызовом Surface.blits.
+
+    Спрайты лежат в SpatialHash по мировым координатам, поэтому видимые
+    находятся запросом по области камеры, а не перебором всех спрайтов.
+    Обновляются только спрайты персонажей, неподвижные остаются на месте.
+    Рисуются спрайты в порядке добавления.
+
+    Перед первой отрисовкой поверхности спрайтов один раз приводятся
+    к формату экрана, при этом одинаковые поверхности конвертируются
+    единожды и остаются общими.
+    """
+    def __init__(self, sprites: Iterable[Sprite] = (), cell_size: int = 256):
+        self._sprites: list[Sprite] = []
+        self._moving_sprites: list[Sprite] = []
+        self._grid = SpatialHash(cell_size)
+        # спрайт -> порядок отрисовки
+        self._order: dict[Sprite, int] = {}
+        self._next_order = 0
+        self._is_converted = False
+        # id исходной поверхности -> (исходная, сконвертированная).
+        # Исходная хранится, чтобы её id не достался другой поверхности.
+        self._converted: dict[int, tuple[pygame.Surface, pygame.Surface]] = {}
+        for sprite in sprites:
+            self.add(sprite)
+
+    def __len__(self) -> int:
+        return len(self._sprites)
+
+    def __iter__(self):
+        return iter(self._sprites)
+
+    def add(self, sprite: Sprite) -> None:
+        self._sprites.append(sprite)
+        if not sprite.is_static:
+            self._moving_sprites.append(sprite)
+        self._order[sprite] = self._next_order
+        self._next_order += 1
+        rect = sprite.rect
+        self._grid.insert(sprite, rect.x, rect.y, rect.width, rect.height)
+        self._is_converted = False
+
+    def remove(self, sprite: Sprite) -> None:
+        self._sprites.remove(sprite)
+        if not sprite.is_static:
+            self._moving_sprites.remove(sprite)
+        del self._order[sprite]
+        self._grid.remove(sprite)
+
+    def update(self):
+        grid = self._grid
+        for sprite in self._moving_sprites:
+            sprite.update()
+            rect = sprite.rect
+            grid.move(sprite, rect.x, rect.y, rect.width, rect.height)
+
+    def draw(self, screen: pygame.Surface, camera: Camera | None = None):
+        """
+        Args:
+            camera: Какую часть мира показать.
+            Без неё мировые координаты совпадают с экранными.
+        """
+        if not self._is_converted:
+            self._convert_surfaces()
+
+        view_rect = camera.view_rect if camera is not None else screen.get_rect()
+        visible = [
+            sprite
+            for sprite
+            in self._grid.query(*view_rect)
+            if view_rect.colliderect(sprite.rect)
+        ]
+        visible.sort(key=self._order.__getitem__)
+
+        dx, dy = view_rect.topleft
+        if not dx and not dy:
+            blit_sequence = [(sprite.surface, sprite.rect) for sprite in visible]
+        else:
+            blit_sequence = [
+                (sprite.surface, sprite.rect.move(-dx, -dy))
+                for sprite
+                in visible
+            ]
+        screen.blits(blit_sequence, doreturn=False)
+
+    def _convert_surfaces(self):
+        # Без установленного режима экрана конвертировать не во что.
+        if pygame.display.get_surface() is None:
+            return
+
+        for sprite in self._sprites:
+            entry = self._converted.get(id(sprite.surface))
+            if entry is None:
+                converted = convert_to_display_format(sprite.surface)
+                entry = (sprite.surface, converted)
+                self._converted[id(sprite.surface)] = entry
+                self._converted[id(converted)] = (converted, converted)
+            sprite.surface = entry[1]
+        self._is_converted = True
@@ -0,0 +1,73 @@
+from collections import OrderedDict
+
+import pygame
+
+
+class TextSurfaceCache:
+    """Кэш отрендеренных строк, общий для всего процесса.
+
+    Одна и та же строка одним и тем же шрифтом рендерится только один раз.
+    Когда суммарный объём поверхностей превышает лимит,
+    выбрасываются те, которые дольше всех не запрашивали.
+    Возвращаемые поверхности общие, поэтому изменять их нельзя.
+    """
+    def __init__(self, max_bytes: int = 4 * 1024 * 1024):
+        self._max_bytes = max_bytes
+        self._surfaces: OrderedDict[tuple, pygame.Surface] = OrderedDict()
+        self._size_in_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def size_in_bytes(self) -> int:
+        return self._size_in_bytes
+
+    def __len__(self) -> int:
+        return len(self._surfaces)
+
+    def render(
+            self,
+            font: pygame.font.Font,
+            text: str,
+            antialias: bool,
+            color: tuple[int, int, int]) -> pygame.Surface:
+        key = (font, text, bool(antialias), tuple(color))
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self._surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        surface = font.render(text, antialias, color)
+        self._surfaces[key] = surface
+        self._size_in_bytes += self._get_size_in_bytes(surface)
+        self._evict()
+        return surface
+
+    def clear(self) -> None:
+        self._surfaces.clear()
+        self._size_in_bytes = 0
+
+    def _evict(self) -> None:
+        # Последнюю добавленную поверхность не выбрасываем,
+        # даже если она одна больше лимита, иначе её бы сразу отрендерили снова.
+        while self._size_in_bytes > self._max_bytes and len(self._surfaces) > 1:
+            _, surface = self._surfaces.popitem(last=False)
+            self._size_in_bytes -= self._get_size_in_bytes(surface)
+
+    @staticmethod
+    def _get_size_in_bytes(surface: pygame.Surface) -> int:
+        return surface.get_pitch() * surface.get_height()
+
+
+text_cache = TextSurfaceCache()
+
+
+def render_text(
+        font: pygame.font.Font,
+        text: str,
+        antialias: bool = False,
+        color: tuple[int, int, int] = (0, 0, 0)) -> pygame.Surface:
+    """Рендерит строку через общий кэш."""
+    return text_cache.render(font, text, antialias, color)
@@ -1,32 +1,171 @@
+import math
 from abc import ABC, abstractmethod
+from typing import Callable, Iterable
 
 import pygame
 
 from sandbox.controllers import Controller
 from sandbox.settings import ControllerSettings
 from sandbox.game_rules import Mover
-from sandbox.view.sprites import Sprite
+from sandbox.input_hub import input_hub
+from sandbox.profiling import FrameProfiler, ProfilerOverlay
+from sandbox.timing import FrameScheduler
+from sandbox.view.camera import Camera
+from sandbox.view.sprites import Sprite, SpriteGroup
 from sandbox.view.controls import Button, Control, Key, Label, RowSetting
+from sandbox.view.display import DisplayManager
+from sandbox.view.fonts import fonts
+
+# Дольше этого окно без анимации не спит, даже если ничего не происходит.
+IDLE_TIMEOUT_MS = 1000
 
 
 class Window(ABC):
-    def __init__(self, caption: str, size: tuple[int, int], controller: Controller):
+    def __init__(
+            self,
+            caption: str,
+            display: DisplayManager,
+            controller: Controller,
+            profiler: FrameProfiler | None = None):
         self._background_color: tuple[int, int, int] = (80, 80, 80)
         self._caption = caption
         self._controls: list[Control] = []
         self._controller = controller
         self._is_showing = True
-        self._screen = pygame.display.set_mode(size)
-        self._size = size
-        pygame.display.set_caption(caption)
+        self._display = display
+        self._screen = display.surface
+        self._size = display.size
+        self._needs_full_redraw = True
+        # None означает, что на экран нужно вывести весь кадр.
+        self._rects_to_present: list[pygame.Rect] | None = []
+        self._profiler = profiler or FrameProfiler()
+        self._profiler_overlay = ProfilerOverlay(
+            self._profiler, fonts.get('Consolas', 14)
+        )
 
-    @abstractmethod
-    def show(self):
-        ...
+    @property
+    def profiler(self) -> FrameProfiler:
+        return self._profiler
+
+    @property
+    def is_showing(self) -> bool:
+        return self._is_showing
+
+    def enter(self):
+        """Вызывается, когда окно оказывается на вершине SceneStack.
+        Экран общий для всех окон, поэтому окно перерисовывается целиком.
+        """
+        self._is_showing = True
+        self._display.set_caption(self._caption)
+        self.invalidate()
 
     def quit(self):
+        """Просит убрать окно из SceneStack после текущего кадра."""
         self._is_showing = False
 
+    def invalidate(self):
+        """Требует полностью перерисовать окно на следующем кадре."""
+        self._needs_full_redraw = True
+
+    def idle_timeout_ms(self) -> int:
+        """Сколько миллисекунд можно ждать событий перед следующим кадром.
+        Окна без анимации между событиями ничего не перерисовывают,
+        поэтому поток может спать, а не рисовать неизменное окно.
+        """
+        if self._needs_full_redraw or self._profiler_overlay.is_visible:
+            return 0
+        delay = self._controller.time_until_next_survey()
+        if delay is None:
+            return IDLE_TIMEOUT_MS
+        return min(IDLE_TIMEOUT_MS, math.ceil(delay * 1000))
+
+    def process_frame(self):
+        """Один проход игрового цикла окна, без ожидания следующего кадра."""
+        self._profiler.begin_frame()
+        events = input_hub.pump()
+        self._profiler.mark('events')
+
+        self._handle_window_events(events)
+        self._controller.conduct_survey_of_controls(events)
+        self._controller.take_snapshot(input_hub.frame)
+        self._profiler.mark('survey')
+
+        self._events_handler()
+        self._profiler.mark('handle')
+
+        self._update()
+        self._profiler.mark('update')
+
+        self._draw_all_components()
+        self._draw_profiler_overlay()
+        self._profiler.mark('draw')
+
+        self._present()
+        self._profiler.mark('present')
+
+        self._controller.deactivate_all_controls()
+        self._profiler.end_frame()
+
+    def _handle_window_events(self, events: list[pygame.event.Event]):
+        """Обрабатывает события, которые относятся к самому окну, а не к игре."""
+        for event in events:
+            if event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                self.invalidate()
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                self._profiler_overlay.toggle()
+                self.invalidate()
+
+    def _update(self):
+        pass
+
+    @abstractmethod
+    def _draw_all_components(self):
+        ...
+
+    def _draw_profiler_overlay(self):
+        if not self._profiler_overlay.is_visible:
+            return
+        rect = self._profiler_overlay.draw(self._screen)
+        if self._rects_to_present is not None:
+            self._rects_to_present.append(rect)
+
+    def _present(self):
+        if self._rects_to_present is None:
+            self._display.update()
+        elif self._rects_to_present:
+            self._display.update(self._rects_to_present)
+        self._rects_to_present = []
+
+    def _draw_dirty_controls(self):
+        """Перерисовывает только те области, в которых контролы
+        изменились с прошлого кадра, и только их отдаёт на вывод.
+        """
+        if self._needs_full_redraw:
+            self._screen.fill(self._background_color)
+            for control in self._controls:
+                control.pop_dirty_rect()
+                control.draw(self._screen)
+            self._rects_to_present = None
+            self._needs_full_redraw = False
+            return
+
+        dirty_rects = [
+            rect
+            for rect
+            in (control.pop_dirty_rect() for control in self._controls)
+            if rect is not None
+        ]
+        if not dirty_rects:
+            return
+
+        for rect in dirty_rects:
+            self._screen.fill(self._background_color, rect)
+        for control in self._controls:
+            if control.rect.collidelist(dirty_rects) != -1:
+                control.draw(self._screen)
+        if self._rects_to_present is not None:
+            self._rects_to_present += dirty_rects
+
     def _events_handler(self):
         self._quit_if_user_wants_to_close_window()
 
@@ -40,32 +179,17 @@ class SettingsWindow(Window):
     def __init__(
             self,
             caption,
-            size,
+            display: DisplayManager,
             settings: ControllerSettings,
-            controller: Controller):
-        super().__init__(caption, size, controller)
+            controller: Controller,
+            profiler: FrameProfiler | None = None):
+        super().__init__(caption, display, controller, profiler)
         self._background_color = (0, 49, 83)
         self._settings = settings
         self._initialize_components()
 
-    def show(self):
-        fps = 30
-        clock = pygame.time.Clock()
-
-        while self._is_showing:
-            events = pygame.event.get()
-            self._controller.conduct_survey_of_controls(events)
-            self._events_handler()
-
-            self._draw_all_components()
-
-            self._controller.deactivate_all_controls()
-            clock.tick(fps)
-
-        self._is_showing = True
-
     def _initialize_components(self):
-        font = pygame.font.SysFont('Consolas', 25)
+        font = fonts.get('Consolas', 25)
         right_setting = RowSetting(
             Label(font, 'right'),
             Key(
@@ -113,17 +237,19 @@ class SettingsWindow(Window):
         self._controls.append(down_setting)
 
         self._selected_item_index = 0
+        # Клавиша, которой сейчас назначается новое значение.
+        self._captured_key: Key | None = None
 
     def _events_handler(self):
+        if self._captured_key is not None:
+            self._capture_new_key(input_hub.events)
+            return
         super()._events_handler()
         self._change_active_setting()
         self._change_key_value()
 
     def _draw_all_components(self):
-        self._screen.fill(self._background_color)
-        for control in self._controls:
-            control.draw(self._screen)
-        pygame.display.update()
+        self._draw_dirty_controls()
 
     def _change_active_setting(self):
         if self._controller.move_up.activated:
@@ -146,115 +272,112 @@ class SettingsWindow(Window):
                 setting.deactivate()
 
     def _change_key_value(self):
-        if self._controller.accept.activated:
-            control = self._controls[self._selected_item_index]
-            if not isinstance(control, RowSetting):
-                return
-
-            key_control = control.key
-            key_control.activate()
-
-            key_number = self._waiting_for_user_assign_new_key(key_control)
-            if key_number is None:
-                return
-
-            key_control.change_text(pygame.key.name(key_number))
-            # TODO: вот это полная хуйня из-за key_control._control
-            # но это решение было вызвано необходимостью связать
-            # элемент управления с UI элементом.
-            key_control._control.update_key_number(key_number)
-
-            key_control._setting.value = key_number
-            self._settings.save()
-
-            key_control.deactivate()
-
-    def _waiting_for_user_assign_new_key(self, key_control: Key) -> int | None:
-        # TODO: Тут дохера логики,
-        # и ивенты, и черчение рамки и апдейт экрана.
-        # Надо подумать как это сделать лаконичней.
-        while True:
-            # TODO: Использовать контроллер.
-            # Но чтобы это сделать,
-            # нужно чтобы контроллер смог отдать любую нажатую клавишу.
-            for event in pygame.event.get():
-                if event.type != pygame.KEYDOWN:
-                    continue
-                if event.key == pygame.K_ESCAPE:
-                    return
-                # TODO: Добавить список возможных клавиш для назначения
-                else:
-                    return event.key
-            key_control.draw_frame(self._screen)
-            pygame.display.update()
+        if not self._controller.accept.activated:
+            return
+        control = self._controls[self._selected_item_index]
+        if not isinstance(control, RowSetting):
+            return
+
+        # Дальше кадры окна идут как обычно, а нажатие клавиши
+        # ловит _capture_new_key.
+        self._captured_key = control.key
+        self._captured_key.activate()
+
+    def _capture_new_key(self, events: list[pygame.event.Event]):
+        # TODO: Использовать контроллер.
+        # Но чтобы это сделать,
+        # нужно чтобы контроллер смог отдать любую нажатую клавишу.
+        for event in events:
+            if event.type != pygame.KEYDOWN:
+                continue
+            key_control = self._captured_key
+            self._captured_key = None
+            # TODO: Добавить список возможных клавиш для назначения
+            if event.key != pygame.K_ESCAPE:
+                self._assign_key(key_control, event.key)  # type: ignore
+            key_control.deactivate()  # type: ignore
+            return
+
+    def _assign_key(self, key_control: Key, key_number: int):
+        key_control.change_text(pygame.key.name(key_number))
+        # TODO: вот это полная хуйня из-за key_control._control
+        # но это решение было вызвано необходимостью связать
+        # элемент управления с UI элементом.
+        key_control._control.update_key_number(key_number)
+
+        key_control._setting.value = key_number
+        self._settings.save()
 
 
 class GameWindow(Window):
     def __init__(
             self,
             caption: str,
-            size: tuple[int, int],
+            display: DisplayManager,
             sprite: Sprite,
             mover: Mover,
-            controller: Controller):
-        super().__init__(caption, size, controller)
+            controller: Controller,
+            scheduler: FrameScheduler | None = None,
+            profiler: FrameProfiler | None = None,
+            camera: Camera | None = None,
+            scenery: Iterable[Sprite] = ()):
+        """
+        Args:
+            camera: Какую часть мира показывать.
+            Без неё мир ограничен экраном.
+            scenery: Неподвижные спрайты мира, рисуются под персонажем.
+        """
+        super().__init__(caption, display, controller, profiler)
         self._background_color = (30, 89, 89)
         self._sprite = sprite
+        self._sprites = SpriteGroup([*scenery, sprite])
         self._mover = mover
+        self._scheduler = scheduler or FrameScheduler()
+        self._camera = camera
 
-    def show(self):
-        while self._is_showing:
-            events = pygame.event.get()
-            self._mover._controller.conduct_survey_of_controls(events)
-            self._events_handler()
+    def enter(self):
+        super().enter()
+        # Время, пока окно было закрыто или перекрыто, симуляции не достаётся.
+        self._scheduler.start()
 
-            self._move_all_objects()
-            self._update_all_objects()
-            self._draw_all_components()
-
-            self._mover._controller.deactivate_all_controls()
+    def idle_timeout_ms(self) -> int:
+        return 0
 
-        self._is_showing = True
+    def _update(self):
+        for _ in range(self._scheduler.simulation_steps()):
+            self._move_all_objects()
+        self._update_all_objects()
 
     def _move_all_objects(self):
         # TODO: вот это полная хуйня из-за _sprite._character
         self._mover.move_character(character=self._sprite._character)
 
     def _update_all_objects(self):
-        self._sprite.update()
+        self._sprites.update()
+        if self._camera is not None:
+            self._camera.update()
 
     def _draw_all_components(self):
         self._screen.fill(self._background_color)
-        self._sprite.draw(self._screen)
-        pygame.display.update()
+        self._sprites.draw(self._screen, self._camera)
+        self._rects_to_present = None
 
 
 class MenuWindow(Window):
-    def __init__(self, caption, size, controller: Controller):
-        super().__init__(caption, size, controller)
+    def __init__(
+            self,
+            caption,
+            display: DisplayManager,
+            controller: Controller,
+            profiler: FrameProfiler | None = None):
+        super().__init__(caption, display, controller, profiler)
         self._background_color = (156, 156, 156)
         self.play_button_handlers = []
         self.settings_button_handlers = []
         self._initialize_components()
 
-    def show(self):
-        fps = 30
-        clock = pygame.time.Clock()
-
-        while self._is_showing:
-            events = pygame.event.get()
-            self._controller.conduct_survey_of_controls(events)
-            self._events_handler()
-
-            self._draw_all_components()
-
-            self._controller.deactivate_all_controls()
-            clock.tick(fps)
-
-        self._is_showing = True
-
     def _initialize_components(self):
-        font = pygame.font.SysFont('Consolas', 25)
+        font = fonts.get('Consolas', 25)
 
         button_play = Button(
             font=font,
@@ -325,20 +448,30 @@ class MenuWindow(Window):
                 control.deactivate()
 
     def _draw_all_components(self):
-        self._screen.fill(self._background_color)
-        for control in self._controls:
-            control.draw(self._screen)
-        pygame.display.update()
+        self._draw_dirty_controls()
 
     def _on_play_button_click(self):
-        self._controller.deactivate_all_controls()
         for handler in self.play_button_handlers:
             handler()
 
     def _on_settings_button_click(self):
-        self._controller.deactivate_all_controls()
         for handler in self.settings_button_handlers:
             handler()
 
     def _on_quit_button_click_handler(self):
         self.quit()
+
+
+class LazyWindow:
+    """Откладывает создание окна до первого обращения к window,
+    чтобы окна, которые пользователь так и не открыл, не замедляли запуск.
+    """
+    def __init__(self, factory: Callable[[], Window]):
+        self._factory = factory
+        self._window: Window | None = None
+
+    @property
+    def window(self) -> Window:
+        if self._window is None:
+            self._window = self._factory()
+        return self._window
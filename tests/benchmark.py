@@ -0,0 +1,312 @@
+import os
+
+# Бенчмарки работают без настоящего окна и без геймпада.
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import argparse  # noqa: E402
+import itertools  # noqa: E402
+import json  # noqa: E402
+import math  # noqa: E402
+import statistics  # noqa: E402
+import sys  # noqa: E402
+import time  # noqa: E402
+from typing import Callable  # noqa: E402
+
+import pygame  # noqa: E402
+
+import setup  # noqa
+from sandbox.combos import ComboLibrary, ComboTracker  # noqa: E402
+from sandbox.controllers import (  # noqa: E402
+    Controller, GamePadAxe, GamePadButton, KeyBindings,
+    PygameGamepad, PygameIntermittentGamepad,
+    PygameKeyboard, PygameIntermittentKeyboard
+)
+from sandbox.input_hub import input_hub  # noqa: E402
+from sandbox.game_rules import CollisionWorld, Mover  # noqa: E402
+from sandbox.model import Character, Point  # noqa: E402
+from sandbox.snapshots import InputSnapshot  # noqa: E402
+from sandbox.settings import ControllerSettings, Setting  # noqa: E402
+from sandbox.view.display import DisplayManager  # noqa: E402
+from sandbox.view.camera import Camera  # noqa: E402
+from sandbox.view.sprites import Sprite, SpriteGroup, get_solid_surface  # noqa: E402
+from sandbox.view.windows import GameWindow, MenuWindow  # noqa: E402
+
+SCREEN_SIZE = (1000, 500)
+
+
+class FakeJoystick:
+    """Подменяет pygame.joystick.Joystick: стик наклонён вправо, нажата кнопка A."""
+    def __init__(self):
+        self._axes = {axe.value: 0.0 for axe in GamePadAxe}
+        self._axes[GamePadAxe.LEFT_STICK_X.value] = 0.8
+        self._buttons = {button.value: False for button in GamePadButton}
+        self._buttons[GamePadButton.A.value] = True
+
+    def get_axis(self, axis: int) -> float:
+        return self._axes.get(axis, 0.0)
+
+    def get_button(self, button: int) -> bool:
+        return self._buttons.get(button, False)
+
+    def get_instance_id(self) -> int:
+        return id(self)
+
+    def get_numaxes(self) -> int:
+        return len(self._axes)
+
+    def get_numbuttons(self) -> int:
+        return max(self._buttons) + 1
+
+    def get_name(self) -> str:
+        return "Fake gamepad"
+
+
+def create_bindings() -> KeyBindings:
+    return KeyBindings.from_settings(
+        ControllerSettings(
+            right=Setting(pygame.K_RIGHT),
+            left=Setting(pygame.K_LEFT),
+            up=Setting(pygame.K_UP),
+            down=Setting(pygame.K_DOWN),
+        )
+    )
+
+
+def create_key_events() -> list[pygame.event.Event]:
+    return [
+        pygame.event.Event(pygame.KEYDOWN, key=pygame.K_RIGHT),
+        pygame.event.Event(pygame.KEYDOWN, key=pygame.K_a),
+        pygame.event.Event(pygame.KEYUP, key=pygame.K_a),
+        pygame.event.Event(
+            pygame.MOUSEMOTION, pos=(10, 10), rel=(1, 1), buttons=(0, 0, 0)
+        ),
+    ]
+
+
+def create_axis_flood(joystick: FakeJoystick) -> list[pygame.event.Event]:
+    """События, которые стик присылает за кадр при быстром движении."""
+    return [
+        pygame.event.Event(
+            pygame.JOYAXISMOTION,
+            instance_id=joystick.get_instance_id(),
+            axis=i % 2,
+            value=i / 64
+        )
+        for i
+        in range(64)
+    ]
+
+
+def combo_feed(controller: Controller) -> Callable[[], None]:
+    """Трекер с 256 комбинациями получает по снимку с новым нажатием за вызов."""
+    library = ComboLibrary(controller.actions)
+    directions = ('up', 'right', 'down', 'left')
+    for steps in itertools.product(directions, repeat=4):
+        library.add('-'.join(steps), steps)
+    tracker = ComboTracker(library)
+    snapshots = []
+    previous = None
+    for i, direction in enumerate(directions * 4):
+        controller.deactivate_all_controls()
+        controller.actions.activate(controller.actions.id_of(direction))
+        previous = InputSnapshot.capture(
+            controller.actions.flags, controller.actions.values, i, previous
+        )
+        snapshots.append(previous)
+    controller.deactivate_all_controls()
+    frames = itertools.cycle(enumerate(snapshots))
+
+    def run():
+        i, snapshot = next(frames)
+        tracker.feed(snapshot, i * 0.016)
+    return run
+
+
+def world_tick(count: int) -> Callable[[], None]:
+    """Тик мира, в котором count персонажей 30×30 стоят сеткой и шагают вправо-влево."""
+    side = 40 * math.ceil(math.sqrt(count))
+    world = CollisionWorld(side, side)
+    characters = []
+    for i in range(count):
+        character = Character(Point(i % (side // 40) * 40, i // (side // 40) * 40))
+        world.add_character(character, 30, 30)
+        characters.append(character)
+    steps = itertools.cycle((3, -3))
+
+    def run():
+        step = next(steps)
+        for character in characters:
+            location = character.location
+            world.move_character(character, location.x + step, location.y)
+    return run
+
+
+def large_world_draw(screen: pygame.Surface, count: int) -> Callable[[], None]:
+    """Отрисовка мира из count неподвижных спрайтов, из которых виден экран."""
+    columns = math.ceil(math.sqrt(count))
+    surface = get_solid_surface((40, 40), (90, 90, 90))
+    sprites = SpriteGroup(
+        Sprite(None, surface, location=(i % columns * 100, i // columns * 100))
+        for i
+        in range(count)
+    )
+    side = columns * 100
+    camera = Camera(screen.get_size(), (side, side))
+    camera.move_to(side / 2, side / 2)
+
+    def run():
+        sprites.update()
+        sprites.draw(screen, camera)
+    return run
+
+
+def measure(function: Callable[[], None], iterations: int, repeats: int) -> dict:
+    """Возвращает время одного вызова в микросекундах."""
+    function()
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            function()
+        samples.append((time.perf_counter() - start) / iterations * 1_000_000)
+    return {
+        'median_us': statistics.median(samples),
+        'min_us': min(samples),
+        'max_us': max(samples),
+    }
+
+
+def survey(
+        controller: Controller,
+        events: list[pygame.event.Event]) -> Callable[[], None]:
+    def run():
+        controller.conduct_survey_of_controls(events)
+        controller.deactivate_all_controls()
+    return run
+
+
+def window_frame(window, events: list[pygame.event.Event]) -> Callable[[], None]:
+    """Один кадр окна без ожидания: события, опрос, обработка, движение, отрисовка."""
+    def run():
+        for event in events:
+            pygame.event.post(event)
+        window.process_frame()
+    return run
+
+
+def run_benchmarks(iterations: int, repeats: int) -> dict[str, dict]:
+    pygame.init()
+    display = DisplayManager(SCREEN_SIZE)
+    bindings = create_bindings()
+    events = create_key_events()
+
+    keyboard = PygameKeyboard(bindings)
+    intermittent_keyboard = PygameIntermittentKeyboard(bindings)
+    joystick = FakeJoystick()
+    gamepad = PygameGamepad(joystick)  # type: ignore
+    intermittent_gamepad = PygameIntermittentGamepad(FakeJoystick())  # type: ignore
+
+    # Контроллеры читают состояние, которое хаб получил из этих событий.
+    input_hub.process_events(events)
+    character = Character(Point(300, 300))
+    mover = Mover(keyboard)
+    keyboard.conduct_survey_of_controls(events)
+
+    game_controller = PygameKeyboard(bindings)
+    game_window = GameWindow(
+        caption='benchmark',
+        display=display,
+        sprite=Sprite(character),
+        mover=Mover(game_controller),
+        controller=game_controller
+    )
+    menu_window = MenuWindow(
+        caption='benchmark | Menu',
+        display=display,
+        controller=PygameIntermittentKeyboard(bindings)
+    )
+    axis_flood = create_axis_flood(joystick)
+    # Стрелки в меню только переключают кнопки, ничего не открывая.
+    menu_events = [pygame.event.Event(pygame.KEYDOWN, key=pygame.K_DOWN)]
+
+    cases: dict[str, Callable[[], None]] = {
+        'input_hub.process_events': lambda: input_hub.process_events(events),
+        'input_hub.process_events_axis_flood': lambda: input_hub.process_events(
+            axis_flood
+        ),
+        'keyboard.conduct_survey_of_controls': survey(keyboard, events),
+        'intermittent_keyboard.conduct_survey_of_controls': survey(
+            intermittent_keyboard, events
+        ),
+        'gamepad.conduct_survey_of_controls': survey(gamepad, []),
+        'intermittent_gamepad.conduct_survey_of_controls': survey(
+            intermittent_gamepad, []
+        ),
+        'controller.deactivate_all_controls': keyboard.deactivate_all_controls,
+        'controller.take_snapshot': lambda: keyboard.take_snapshot(input_hub.frame),
+        'combo_tracker.feed': combo_feed(PygameKeyboard(bindings)),
+        'mover.move_character': lambda: mover.move_character(character),
+        'collision_world.tick_100': world_tick(100),
+        'collision_world.tick_1000': world_tick(1000),
+        'sprite_group.draw_large_world': large_world_draw(display.surface, 100_000),
+        'game_window.frame': window_frame(game_window, events),
+        'menu_window.frame': window_frame(menu_window, menu_events),
+    }
+    return {
+        name: measure(function, iterations, repeats)
+        for name, function
+        in cases.items()
+    }
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    """Возвращает описания бенчмарков, которые стали медленнее базовой линии."""
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        expected = baseline[name]['median_us']
+        actual = result['median_us']
+        if actual > expected * (1 + tolerance):
+            regressions.append(
+                f"{name}: {actual:.2f} us, baseline {expected:.2f} us "
+                f"(+{(actual / expected - 1) * 100:.0f}%)"
+            )
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Headless benchmarks of the per-frame path"
+    )
+    parser.add_argument('--iterations', type=int, default=2000)
+    parser.add_argument('--repeats', type=int, default=7)
+    parser.add_argument('--output', help="write results as JSON to this file")
+    parser.add_argument('--baseline', help="JSON file with results to compare against")
+    parser.add_argument(
+        '--tolerance', type=float, default=0.25,
+        help="allowed slowdown relative to the baseline, 0.25 means 25%%"
+    )
+    args = parser.parse_args()
+
+    results = run_benchmarks(args.iterations, args.repeats)
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, 'w') as file:
+            file.write(output)
+    else:
+        print(output)
+
+    if not args.baseline:
+        return 0
+    with open(args.baseline, 'r') as file:
+        baseline = json.loads(file.read())
+    regressions = compare(results, baseline, args.tolerance)
+    for regression in regressions:
+        print(f"REGRESSION {regression}", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -2,10 +2,14 @@ import pygame
 
 import setup  # noqa
 from sandbox.controllers import (
-    Controller, PygameKeyboard, PygameIntermittentKeyboard,
+    Controller, KeyBindings, PygameKeyboard, PygameIntermittentKeyboard,
     PygameGamepad, PygameIntermittentGamepad
 )
+from sandbox.gamepads import GamepadManager
+from sandbox.input_hub import input_hub
 from sandbox.settings import ControllerSettings, Setting
+from sandbox.view.fonts import fonts
+from sandbox.view.text import render_text
 
 pygame.init()
 
@@ -18,7 +22,7 @@ class Text:
 
     def render(self, value: str, location: tuple[int, int]):
         self._screen.blit(
-            self._font.render(value, False, self._color),
+            render_text(self._font, value, False, self._color),
             location
         )
 
@@ -31,24 +35,41 @@ class Test:
             up=Setting(1073741906),
             down=Setting(1073741905),
         )
+        bindings = KeyBindings.from_settings(settings)
         self._controllers: list[Controller] = [
-            PygameKeyboard(settings),
-            PygameGamepad(),
-            PygameIntermittentKeyboard(settings),
-            PygameIntermittentGamepad(),
+            PygameKeyboard(bindings),
+            PygameIntermittentKeyboard(bindings),
         ]
         self._controller_index = 0
         self._controller = self._controllers[self._controller_index]
 
+        # Геймпады можно подключать и отключать прямо во время теста.
+        self._gamepads = GamepadManager(PygameGamepad)
+        self._intermittent_gamepads = GamepadManager(PygameIntermittentGamepad)
+        for manager in (self._gamepads, self._intermittent_gamepads):
+            manager.added_handlers.append(self._add_controller)
+            manager.removed_handlers.append(self._remove_controller)
+
+    def _add_controller(self, instance_id: int, controller: Controller) -> None:
+        self._controllers.append(controller)
+
+    def _remove_controller(self, instance_id: int, controller: Controller) -> None:
+        self._controllers.remove(controller)
+        if self._controller is controller:
+            self._controller_index = 0
+            self._controller = self._controllers[0]
+        else:
+            self._controller_index = self._controllers.index(self._controller)
+
     def _render_labels(self, text):
         text.render("For change controller press \"accept\" on a keyboard", (10, 10))
         text.render(f"current controller: {self._controller}", (10, 35))
-        text.render(f"up={self._controller.move_up._activated}", (10, 60))
-        text.render(f"right={self._controller.move_right._activated}", (10, 85))
-        text.render(f"down={self._controller.move_down._activated}", (10, 110))
-        text.render(f"left={self._controller.move_left._activated}", (10, 135))
-        text.render(f"accept={self._controller.accept._activated}", (10, 160))
-        text.render(f"quit={self._controller.quit._activated}", (10, 185))
+        text.render(f"up={self._controller.move_up.activated}", (10, 60))
+        text.render(f"right={self._controller.move_right.activated}", (10, 85))
+        text.render(f"down={self._controller.move_down.activated}", (10, 110))
+        text.render(f"left={self._controller.move_left.activated}", (10, 135))
+        text.render(f"accept={self._controller.accept.activated}", (10, 160))
+        text.render(f"quit={self._controller.quit.activated}", (10, 185))
 
     def _quit_button_is_pressed(self, event):
         return (
@@ -68,12 +89,12 @@ class Test:
         clock = pygame.time.Clock()
         fps = 30
 
-        font = pygame.font.SysFont('Consolas', 25)
+        font = fonts.get('Consolas', 25)
         black_color = (0, 0, 0)
         text = Text(screen, font, black_color)
 
         while not close_window:
-            events = pygame.event.get()
+            events = input_hub.pump()
             self._controller.conduct_survey_of_controls(events)
             if self._controller.quit.activated:
                 return
@@ -93,7 +114,6 @@ class Test:
         pygame.init()
         pygame.joystick.init()
 
-        pygame.key.set_repeat(500)
         screen = pygame.display.set_mode(SCREEN_SIZE)
         blue = (0, 49, 83)
 
@@ -2,6 +2,8 @@ import pygame
 
 import setup  # noqa
 from sandbox.controllers import GamePadAxe, GamePadButton  # type: ignore
+from sandbox.view.fonts import fonts  # type: ignore
+from sandbox.view.text import render_text  # type: ignore
 
 
 class Text:
@@ -12,7 +14,7 @@ class Text:
 
     def render(self, value: str, location: tuple[int, int]):
         self._screen.blit(
-            self._font.render(value, False, self._color),
+            render_text(self._font, value, False, self._color),
             location
         )
 
@@ -29,7 +31,7 @@ class Test:
         clock = pygame.time.Clock()
         fps = 30
 
-        font = pygame.font.SysFont('Consolas', 25)
+        font = fonts.get('Consolas', 25)
         black_color = (0, 0, 0)
         text = Text(screen, font, black_color)
 